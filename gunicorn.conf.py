@@ -1,5 +1,28 @@
 # Gunicorn configuration
+import os
+import threading
+
 bind = "0.0.0.0:10000"
-workers = 4  # Balance: faster than 2, safer than 15 for 512MB limit
+workers = int(os.environ.get("WEB_CONCURRENCY", 4))  # Balance: faster than 2, safer than 15 for 512MB limit
+# Requests spend their time waiting on CDNs - threads let one worker serve
+# several at once without another process. scrape_api and the scrapers size
+# their pools from the same GUNICORN_THREADS (scrapers/common.py REQUEST_THREADS,
+# read before the app is on sys.path, so keep the default 4 in step here).
+# Not an async worker (Quart/uvicorn): every scraper blocks in requests and
+# urllib3, so an event loop would stall on the first probe; cached answers
+# already return without touching a CDN
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
 timeout = 300  # 5 min - allows large batches (100-150 SKUs)
+# n8n fires SKU after SKU through the platform proxy - keep its connections
+# open (gthread parks idle ones in the poller, not on a thread). Longer than
+# the proxy's own idle timeout, so it never reuses a socket we just closed
+keepalive = 75
 preload_app = True
+
+
+def post_fork(server, worker):
+    # Warm CDN connections per worker - sockets opened before the fork
+    # (preload_app) would be shared between workers
+    from scrape_api import warm_cdn_connections
+    threading.Thread(target=warm_cdn_connections, daemon=True).start()
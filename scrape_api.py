@@ -3,39 +3,182 @@ Fashion Scraper API - OPTIMIZED PARALLEL + MANGO BASE64
 All brands with parallel validation, MANGO downloads and returns base64
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, g, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import requests
+import urllib3
 from requests.adapters import HTTPAdapter, Retry
 import hashlib
 import time
 import re
 import base64
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import socket
+import sqlite3
+import threading
+import os
+import importlib
+import logging
+from collections import OrderedDict
+from functools import lru_cache, wraps
+from itertools import count, islice
+from types import MappingProxyType
+from typing import NamedTuple
+from urllib.parse import urlsplit
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 # Import scraper modula
+from scrapers.common import HASH_PREFIX_BYTES, HASH_RANGE, REQUEST_THREADS, body_size
 from scrapers import dsquared2
 from scrapers import emporio_armani
 from scrapers import etro as etro_module
 from scrapers import antony_morato
+from scrapers import liujo
+
+# Optional scraper modula - endpoint answers 500 if the file is missing.
+# A module that is there but fails to import (missing bs4...) is logged
+def optional_scraper(name):
+    module = f"scrapers.{name}"
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        if e.name != module:
+            # Same logger as app.logger (app.name == __name__), which does not exist yet
+            logging.getLogger(__name__).exception("Scraper module %s failed to import", module)
+        return None
+
+michael_kors = optional_scraper("michael_kors")
+superdry = optional_scraper("superdry")
+joop = optional_scraper("joop")
+strellson = optional_scraper("strellson")
+woolrich = optional_scraper("woolrich")
+falke = optional_scraper("falke")
+enterprise_japan = optional_scraper("enterprise_japan")
+coach = optional_scraper("scrape_coach")
+levis = optional_scraper("scrape_levis")
+golden_goose = optional_scraper("scrape_golden_goose")
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
 
 
 app = Flask(__name__)
 CORS(app)
 
+
+class ScrapeJSONProvider(DefaultJSONProvider):
+    """jsonify() that notes on g whether the payload is worth caching - decided on the dict, before it is encoded"""
+
+    def response(self, *args, **kwargs):
+        g.worth_caching = worth_caching(self._prepare_response_obj(args, kwargs))
+        return super().response(*args, **kwargs)
+
+
+class OrjsonProvider(ScrapeJSONProvider):
+    """jsonify() / request.json through orjson - same sorted-key JSON, C encoder"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_SORT_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        g.worth_caching = worth_caching(obj)
+        body = orjson.dumps(obj, default=self.default, option=orjson.OPT_SORT_KEYS)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+app.json = OrjsonProvider(app) if HAS_ORJSON else ScrapeJSONProvider(app)
+
+
+def json_bytes(obj):
+    """obj as JSON bytes - orjson's own output when available, no str round trip"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return app.json.dumps(obj).encode()
+
+def json_response(body, status=200):
+    """Response for already-encoded JSON bytes - skips jsonify()'s dumps"""
+    return app.response_class(body, status=status, mimetype="application/json")
+
 # ===================== CONSTANTS =====================
 TIMEOUT = 10
 MIN_BYTES = 8000
+UNTYPED_MIN_BYTES = 20000  # Body without an image Content-Type must exceed this
 MAX_VALIDATION_WORKERS = 15  # Parallel workers - fast batch processing
+POOL_SIZE = MAX_VALIDATION_WORKERS * REQUEST_THREADS  # Validation lanes per worker
+HEAD_UNSUPPORTED = (403, 405, 501)  # CDN refuses HEAD - fall back to GET
+RETRY_STATUSES = (429, 500, 502, 503, 504)  # Transient - retried, never cached
+MISS_STATUSES = (404, 410)  # Surely no image - the only statuses cached as misses
+SCRAPE_CACHE_SIZE = 2048  # Cached responses per worker
+SCRAPE_CACHE_TTL = 600  # 10 min - n8n retries hit the cache
+MANGO_RESPONSE_CACHE_SIZE = 32  # Serialized MANGO responses, a few MB each...
+MANGO_RESPONSE_CACHE_BYTES = 16 * 1024 * 1024  # ...but never more than this per worker
+URL_CACHE_SIZE = 4096  # SKU -> candidate URL list, per brand
+URL_RESULT_CACHE_SIZE = 20000  # Per-URL validation outcomes
+URL_HIT_TTL = 86400  # 1 day - published images rarely change
+URL_MISS_TTL = 3600  # 1 hour - old-season 404s stay 404
+URL_ETAG_TTL = 7 * 86400  # ETags outlive url_hit_cache - a 304 refreshes the hit
+# On-disk probe outcomes shared by all gunicorn workers and restarts - opt-in,
+# set it to a file on persistent, writable disk ("" = off, the default)
+PROBE_DB_PATH = os.environ.get("PROBE_CACHE_DB", "")
+PROBE_DB_TIMEOUT = 2  # Seconds to wait on a locked DB before skipping it
+PROBE_DB_PRUNE_EVERY = 1000  # Writes per process between deletes of expired rows
+
+# Precompiled SKU patterns - ASCII only (SKUs are ASCII), whole-SKU ones used with fullmatch()
+WHITESPACE_RE = re.compile(r"\s+")
+# REPLAY: M3015 {2660}323 or AW2608 {A0500C}0103
+REPLAY_SKU_RE = re.compile(r'([A-Z0-9]+)\s*\{([^}]+)\}(.+)', re.ASCII)
+REPLAY_BRACES_RE = re.compile(r'[{}]')
+DIGITS_RE = re.compile(r"\d+", re.ASCII)
+# PAUL TAYLOR: PT7SSC102-001 (letters) or PT7121234-001 (digits)
+PT_ALPHA_RE = re.compile(r"PT7([A-Z]{2})([A-Z])(\d{3})-(\d{3})", re.ASCII)
+PT_DIGIT_RE = re.compile(r"PT7(\d{2})(\d{4})-(\d{3})", re.ASCII)
+
+# Image CDNs hit by the endpoints below - warmed once per worker
+CDN_HOSTS = (
+    "images.hugoboss.com", "ca.maje.com", "shop.mango.com", "tommy-europe.scene7.com",
+    "media.i.allsaints.com", "calvinklein-eu.scene7.com", "shop.diesel.com",
+    "media.global.kurtgeiger.com", "katespade.scene7.com", "paultaylor.it",
+    "www.mooseknucklescanada.com", "scotch-soda.eu", "img.guess.com", "assets.armani.com",
+    "cdn.patriziapepe.com", "www.sandro.ae", "global.sandro-paris.com", "eu.sandro-paris.com",
+    "us.sandro-paris.com", "uk.sandro-paris.com", "replayjeans.kleecks-cdn.com",
+    "assets-cf.armani.com", "cdn.antonymorato.com.filoblu.com",
+)
+WARM_TIMEOUT = 3
+# Sockets pre-opened per CDN host - HTTP/1.1 needs one per in-flight probe,
+# so a cold worker's first parallel burst would otherwise pay a TLS
+# handshake on every lane
+WARM_CONNECTIONS = 4
+DNS_CACHE_TTL = 300  # 5 min - CDN records rarely move, re-resolve anyway
 
 # ===================== HTTP SESSION =====================
 def make_session(headers=None):
     s = requests.Session()
-    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
-    s.mount("https://", HTTPAdapter(max_retries=retries))
-    s.mount("http://", HTTPAdapter(max_retries=retries))
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=RETRY_STATUSES)
+    # One keep-alive connection per validation lane, so a whole batch of
+    # same-CDN probes reuses sockets instead of re-handshaking TLS
+    # pool_connections = number of per-host pools kept, enough for every CDN
+    adapter = HTTPAdapter(pool_connections=len(CDN_HOSTS), pool_maxsize=POOL_SIZE,
+                          max_retries=retries)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
     default_headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124 Safari/537.36"
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124 Safari/537.36",
+        # Raw bytes only: nothing to decompress, and Range / Content-Length
+        # then count image bytes rather than gzip bytes
+        "Accept-Encoding": "identity",
     }
     if headers:
         default_headers.update(headers)
@@ -45,82 +188,589 @@ def make_session(headers=None):
 # Default session
 session = make_session()
 
-# ===================== HELPERS =====================
-def sha1_hash(content: bytes) -> str:
-    return hashlib.sha1(content).hexdigest()
+# Bare urllib3 pool for HEAD probes - a probe only needs status + headers,
+# so it skips requests' per-call URL re-parse, cookie merge and hooks
+head_pool = urllib3.PoolManager(
+    num_pools=len(CDN_HOSTS),
+    maxsize=POOL_SIZE,
+    retries=urllib3.Retry(total=None, connect=1, read=0, redirect=5),
+    timeout=urllib3.Timeout(connect=3, read=TIMEOUT),
+)
+
+# Brand sessions with fixed headers - module level so their keep-alive
+# pools survive between requests instead of being rebuilt per call
+# IMPORTANT: Request JPEG/PNG only, explicitly reject AVIF/WebP (Modal can't process them)
+mango_session = make_session({
+    "Accept": "image/jpeg,image/png;q=0.9,image/*;q=0.1",
+    "Referer": "https://shop.mango.com/",
+    "Accept-Language": "en-US,en;q=0.9"
+})
+allsaints_session = make_session({
+    "Accept": "image/jpeg,image/*;q=0.8",
+    "Referer": "https://www.allsaints.com/"
+})
+
+
+# Shared per-worker pool - threads are started once and reused by every
+# request instead of being spawned and joined per call. Each request keeps
+# at most MAX_VALIDATION_WORKERS in flight, so REQUEST_THREADS concurrent
+# requests never queue behind each other
+validation_executor = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="validate")
+
+
+def warm_cdn_connections():
+    """
+    Resolve DNS and open WARM_CONNECTIONS keep-alive TLS connections to
+    every CDN host, in both pools a validation touches: head_pool for the
+    probe and the session for the GET. Same-host warms run concurrently, so
+    each one checks out (and leaves behind) its own socket
+    """
+    def warm(host):
+        try:
+            head_pool.request("HEAD", f"https://{host}/", retries=False, timeout=WARM_TIMEOUT)
+            session.head(f"https://{host}/", timeout=WARM_TIMEOUT)
+        except Exception:
+            pass
 
-def validate_image(url: str, custom_session=None, min_bytes=MIN_BYTES) -> tuple:
-    """Check if URL returns valid image. Returns (is_valid, content, hash)"""
-    s = custom_session or session
+    list(validation_executor.map(warm, CDN_HOSTS * WARM_CONNECTIONS))
+
+# ===================== CACHE =====================
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after `ttl` seconds. With
+    maxbytes, weigh(value) sizes each entry and the total is capped too.
+    """
+
+    def __init__(self, maxsize, ttl, maxbytes=None, weigh=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.weigh = weigh
+        self._bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _pop(self, key):
+        _, value = self._data.pop(key)
+        if self.maxbytes is not None:
+            self._bytes -= self.weigh(value)
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                self._pop(key)
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            if self.maxbytes is not None:
+                self._bytes += self.weigh(value)
+            while len(self._data) > self.maxsize or (self.maxbytes is not None and self._bytes > self.maxbytes):
+                self._pop(next(iter(self._data)))
+
+
+scrape_cache = TTLCache(SCRAPE_CACHE_SIZE, SCRAPE_CACHE_TTL)
+# Whole MANGO responses (5 inline base64 images) - own, much smaller cache,
+# capped by bytes; the only MANGO body cache, images are not kept twice
+mango_response_cache = TTLCache(MANGO_RESPONSE_CACHE_SIZE, SCRAPE_CACHE_TTL,
+                                maxbytes=MANGO_RESPONSE_CACHE_BYTES, weigh=lambda entry: len(entry[0]))
+dns_cache = TTLCache(len(CDN_HOSTS) * 4, DNS_CACHE_TTL)
+url_hit_cache = TTLCache(URL_RESULT_CACHE_SIZE, URL_HIT_TTL)  # url -> content hash
+url_miss_cache = TTLCache(URL_RESULT_CACHE_SIZE, URL_MISS_TTL)  # url -> True
+url_etag_cache = TTLCache(URL_RESULT_CACHE_SIZE, URL_ETAG_TTL)  # url -> (etag, content hash)
+
+# Hashes from another algorithm never compare equal - one table per algorithm
+# (raw digest BLOBs - rows from the old hex-text tables are not reused)
+PROBE_TABLE = "probe_digests_xxh3" if HAS_XXHASH else "probe_digests_sha1"
+probe_db_local = threading.local()
+probe_db_off = threading.Event()  # Set once the DB could not be opened - no retry per probe
+probe_db_pruned = threading.Event()  # Startup prune done - once per process, not per thread
+probe_db_lock = threading.Lock()
+probe_db_writes = count(1)  # Process-wide write counter for the periodic prune
+
+
+def probe_db():
+    """
+    Per-thread connection to the shared probe DB (WAL - readers never block).
+    If it cannot be opened the DB stays off for this process.
+    """
+    db = getattr(probe_db_local, "db", None)
+    if db is None:
+        try:
+            db = sqlite3.connect(PROBE_DB_PATH, timeout=PROBE_DB_TIMEOUT, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(f"CREATE TABLE IF NOT EXISTS {PROBE_TABLE} (url TEXT PRIMARY KEY, hash BLOB, checked REAL)")
+            db.execute(f"CREATE INDEX IF NOT EXISTS {PROBE_TABLE}_checked ON {PROBE_TABLE} (checked)")
+        except sqlite3.Error:
+            probe_db_off.set()
+            app.logger.exception("Probe DB %s unavailable - disabled for this worker", PROBE_DB_PATH)
+            raise
+        probe_db_local.db = db
+        with probe_db_lock:
+            if not probe_db_pruned.is_set():
+                prune_probe_db(db)
+                probe_db_pruned.set()
+    return db
+
+
+def prune_probe_db(db):
+    """Delete rows load_probe() would skip anyway - otherwise the file only grows"""
+    now = time.time()
     try:
-        r = s.get(url, timeout=TIMEOUT)
-        if r.status_code == 200 and r.content and len(r.content) > min_bytes:
-            content_type = r.headers.get("Content-Type", "").lower()
-            if "image" in content_type or len(r.content) > 20000:
-                return True, r.content, sha1_hash(r.content)
-        return False, None, None
-    except Exception:
-        return False, None, None
+        db.execute(f"DELETE FROM {PROBE_TABLE} WHERE checked < ? OR (hash IS NULL AND checked < ?)",
+                   (now - URL_HIT_TTL, now - URL_MISS_TTL))
+    except sqlite3.Error:
+        pass
+
+
+def load_probe(url):
+    """
+    (valid, hash) if any worker probed url within URL_HIT_TTL / URL_MISS_TTL,
+    else None. The DB is only an optimisation - errors count as "unknown".
+    """
+    if not PROBE_DB_PATH or probe_db_off.is_set():
+        return None
+    try:
+        row = probe_db().execute(f"SELECT hash, checked FROM {PROBE_TABLE} WHERE url = ?", (url,)).fetchone()
+    except sqlite3.Error:
+        return None
+    if row is None:
+        return None
+    img_hash, checked = row
+    ttl = URL_HIT_TTL if img_hash is not None else URL_MISS_TTL
+    if time.time() - checked >= ttl:
+        return None
+    return img_hash is not None, img_hash
+
+
+def store_probe(url, img_hash):
+    """Record a definite probe outcome (img_hash None = miss) for every worker"""
+    if not PROBE_DB_PATH or probe_db_off.is_set():
+        return
+    try:
+        db = probe_db()
+        db.execute(f"INSERT OR REPLACE INTO {PROBE_TABLE} VALUES (?, ?, ?)", (url, img_hash, time.time()))
+    except sqlite3.Error:
+        return
+    if next(probe_db_writes) % PROBE_DB_PRUNE_EVERY == 0:
+        prune_probe_db(db)
+
+
+_system_getaddrinfo = socket.getaddrinfo
+
+
+def cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    """
+    socket.getaddrinfo with a short TTL cache for the known CDN hosts, so
+    reconnects after a pool eviction skip the DNS round trip.
+    Any other host goes straight to the system resolver.
+    """
+    if host not in CDN_HOSTS:
+        return _system_getaddrinfo(host, port, family, type, proto, flags)
+    key = (host, port, family, type, proto, flags)
+    addrs = dns_cache.get(key)
+    if addrs is None:
+        addrs = _system_getaddrinfo(host, port, family, type, proto, flags)
+        dns_cache.set(key, addrs)
+    return addrs
+
+
+socket.getaddrinfo = cached_getaddrinfo
+
+
+class ScrapeRequest(NamedTuple):
+    """Single-SKU request body, parsed once and shared by the decorators and handler"""
+    sku: str
+    max_images: object = 5  # as sent - handlers slice/compare with it
+    validate: object = None  # as sent, None when absent
+
+    def validate_or(self, default):
+        """validate flag as sent, else the brand's default"""
+        return default if self.validate is None else self.validate
+
+def request_body():
+    """JSON object body of this request - {} for a missing, invalid or non-object body"""
+    data = request.get_json(silent=True)
+    return data if isinstance(data, dict) else {}
+
+def scrape_request(data=None):
+    """
+    This request's ScrapeRequest - parsed from `data` when the caller already
+    has the body (/scrape, /scrape-batch), else from the JSON body on first
+    use, then kept on g.
+    """
+    req = g.get("scrape_request")
+    if req is None:
+        if data is None:
+            data = request_body()
+        req = g.scrape_request = ScrapeRequest(str(data.get('sku') or '').strip(),
+                                               data.get('max_images', 5), data.get('validate'))
+    return req
+
+
+# Cache keys being scraped right now -> Event set when the scrape finishes
+scrapes_in_flight = {}
+scrapes_in_flight_lock = threading.Lock()
+
+
+def cacheable_response(body, etag):
+    """
+    200 for a cached scrape body, tagged so n8n / a proxy can revalidate -
+    a matching If-None-Match gets an empty 304 instead of the body again.
+    Only for bodies response_cache keeps, never for errors or empty results
+    """
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = json_response(body)
+    response.set_etag(etag)
+    response.cache_control.max_age = SCRAPE_CACHE_TTL
+    return response
+
+
+def worth_caching(data):
+    """
+    True for a scrape payload with images and no error. Module scrapers answer
+    200 with {"error": ...} on a page timeout, and probes that all raised
+    give 200 with no images - both may well work on the next retry.
+    Checked by the JSON provider on the dict, so no body is decoded again.
+    """
+    return isinstance(data, dict) and not data.get("error") and bool(data.get("images"))
+
+
+def response_cache(cache):
+    """
+    Cache successful endpoint responses (see worth_caching) in `cache` by
+    (endpoint, sku, max_images, validate), with an ETag of the body. Identical requests
+    arriving while the first is still scraping wait for its result instead
+    of running the same probe cascade again.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper():
+            req = scrape_request()
+            key = (fn.__name__, req.sku, repr(req.max_images), repr(req.validate))
+            entry = cache.get(key)
+            if entry is not None:
+                return cacheable_response(*entry)
+
+            with scrapes_in_flight_lock:
+                done = scrapes_in_flight.get(key)
+                if done is None:
+                    scrapes_in_flight[key] = threading.Event()
+            if done is not None:
+                done.wait()
+                entry = cache.get(key)
+                if entry is not None:
+                    return cacheable_response(*entry)
+                return fn()  # first scrape failed - not cached, try ourselves
+
+            try:
+                g.worth_caching = False  # set by jsonify() - pre-encoded bodies are never cached
+                response = fn()
+                if getattr(response, "status_code", None) == 200 and g.worth_caching:
+                    body = response.get_data()
+                    entry = (body, content_hash(body).hex())
+                    cache.set(key, entry)
+                    return cacheable_response(*entry)
+                return response  # errors / no images: untagged, nothing pins them
+            finally:
+                with scrapes_in_flight_lock:
+                    scrapes_in_flight.pop(key).set()
+        return wrapper
+    return decorator
+
+# Default for every SKU endpoint
+ttl_cache_sku = response_cache(scrape_cache)
+
+
+# ===================== REQUEST PARSING =====================
+# Answer to a body without a SKU - always the same, encoded once
+SKU_REQUIRED_BODY = json_bytes({"error": "SKU required", "sku": "", "images": []})
+
+def sku_endpoint(fn):
+    """
+    Parse the {"sku", "max_images"} body once and call fn(sku, max_images).
+    A missing SKU is answered with 400 before the handler runs; a handler
+    that raises is logged with its traceback and answered with a JSON 500.
+    """
+    @wraps(fn)
+    def wrapper():
+        sku, max_images, _ = scrape_request()
+        if not sku:
+            return json_response(SKU_REQUIRED_BODY, 400)
+        try:
+            return fn(sku, max_images)
+        except Exception as e:
+            app.logger.exception("%s failed for SKU %r", fn.__name__, sku)
+            return jsonify({"error": str(e), "sku": sku, "images": []}), 500
+    return wrapper
+
+
+# ===================== HELPERS =====================
+def content_hash(content: bytes) -> bytes:
+    """Dedup fingerprint of an image body - equality only, not security"""
+    if HAS_XXHASH:
+        return xxhash.xxh3_128(content).digest()
+    return hashlib.sha1(content, usedforsecurity=False).digest()
+
+def prefix_hash(content, size):
+    """
+    Dedup key of a (possibly ranged) body: its first HASH_PREFIX_BYTES + full
+    size. Same digest as content_hash() of the joined bytes, but fed through
+    a memoryview so the 64 KiB prefix is never copied.
+    """
+    hasher = xxhash.xxh3_128() if HAS_XXHASH else hashlib.sha1(usedforsecurity=False)
+    hasher.update(memoryview(content)[:HASH_PREFIX_BYTES])
+    hasher.update(b"/%d" % size)
+    return hasher.digest()
+
+# Per-host probe method, learned on first contact:
+# "head" (default), "range" (HEAD refused, Range honoured) or None (GET only)
+probe_method = {}
+
+@lru_cache(maxsize=None)
+def probe_headers(s, ranged=False):
+    """
+    Plain-dict copy of a session's fixed headers for head_pool, built once
+    per (session, ranged) instead of on every probe. Shared, do not mutate.
+    """
+    headers = dict(s.headers)
+    if ranged:
+        headers["Range"] = "bytes=0-0"
+    return headers
+
+def probe_head(url, s, min_bytes=MIN_BYTES):
+    """
+    Cheap pre-check before downloading the body: HEAD, or a 1-byte ranged GET
+    on CDNs that refuse HEAD.
+    Returns False only when the URL is surely not a valid image (missing,
+    declared smaller than min_bytes, or a small non-image); True means
+    "GET it to be sure"; bytes are the dedup key of a confirmed image.
+    """
+    host = urlsplit(url).hostname
+    method = probe_method.get(host, "head")
+
+    if method == "head":
+        r = head_pool.request("HEAD", url, headers=probe_headers(s))
+        if r.status not in HEAD_UNSUPPORTED:
+            if r.status in RETRY_STATUSES:
+                return True  # let the retrying GET decide
+            if r.status != 200:
+                raise_unless_miss(r.status)
+                return False
+            return head_verdict(r.headers, r.headers.get("Content-Length", ""), min_bytes)
+        probe_method[host] = method = "range"
+
+    if method == "range":
+        r = head_pool.request("GET", url, headers=probe_headers(s, ranged=True))
+        if r.status == 206:
+            # Content-Range: bytes 0-0/<total size>
+            total = r.headers.get("Content-Range", "").rpartition("/")[2]
+            return head_verdict(r.headers, total, min_bytes)
+        if r.status == 200:
+            # Range ignored - full body came back, stop probing this host
+            probe_method[host] = None
+            return head_verdict(r.headers, r.headers.get("Content-Length", ""), min_bytes)
+        if r.status in HEAD_UNSUPPORTED or r.status in RETRY_STATUSES:
+            return True
+        raise_unless_miss(r.status)
+        return False
+
+    return True
+
+def too_small(length, min_bytes):
+    """True when a declared size header says the body is at most min_bytes"""
+    return length.isdigit() and 0 < int(length) <= min_bytes
+
+def plausible_image(headers, length, min_bytes):
+    """
+    Mirror of the GET acceptance rule on declared headers only: False when
+    the size, or a non-image Content-Type with a small size, rules it out.
+    """
+    if too_small(length, min_bytes):
+        return False
+    content_type = headers.get("Content-Type", "").lower()
+    return "image" in content_type or not too_small(length, UNTYPED_MIN_BYTES)
+
+def head_verdict(headers, length, min_bytes):
+    """
+    probe_head result from declared headers. A sized image with a strong
+    ETag needs no body: the ETag is its dedup key. Content-Length or
+    Last-Modified alone are not unique enough to stand in for a hash.
+    """
+    if not plausible_image(headers, length, min_bytes):
+        return False
+    etag = headers.get("ETag", "")
+    is_image = "image" in headers.get("Content-Type", "").lower()
+    if etag and not etag.startswith("W/") and length.isdigit() and is_image:
+        return b"etag:" + etag.encode()
+    return True
+
+class UncertainStatus(Exception):
+    """Non-image status that is no definite miss (403 bot wall, 5xx...) - never cached"""
+
+def raise_unless_miss(status):
+    """Let a definite-miss status through; raise UncertainStatus for anything else"""
+    if status not in MISS_STATUSES:
+        raise UncertainStatus(status)
+
+class Hit(NamedTuple):
+    """Outcome of validating one candidate URL (immutable, no per-record dict)"""
+    url: str
+    valid: bool
+    content: str = None  # base64 body, MANGO only
+    hash: bytes = None  # raw digest (or ETag key) - dedup only, never serialized
+    metadata: object = None  # metadata dict, or candidate index for MANGO
+
+def cache_url_results(fn):
+    """
+    Serve repeat URLs of a validator fn((url, metadata, ...)) -> Hit from
+    url_hit_cache / url_miss_cache, then from the on-disk probe DB shared
+    by all workers. Only definite answers are cached - a validator that
+    raises (timeout, exhausted retries) is retried next time.
+    """
+    @wraps(fn)
+    def wrapper(args):
+        url, metadata = args[0], args[1]
+        img_hash = url_hit_cache.get(url)
+        if img_hash is not None:
+            return Hit(url, True, hash=img_hash, metadata=metadata)
+        if url_miss_cache.get(url):
+            return Hit(url, False, metadata=metadata)
+        stored = load_probe(url)
+        if stored is not None:
+            hit = Hit(url, stored[0], hash=stored[1], metadata=metadata)
+        else:
+            hit = fn(args)
+            store_probe(url, hit.hash if hit.valid else None)
+        if hit.valid:
+            url_hit_cache.set(url, hit.hash)
+        else:
+            url_miss_cache.set(url, True)
+        return hit
+    return wrapper
 
+@cache_url_results
 def validate_single_url(args):
-    """Validate a single URL - used by parallel executor"""
+    """
+    Validate a single URL - used by parallel executor.
+    A HEAD that carries a strong ETag settles it without a body; otherwise
+    fetches and hashes only the first HASH_PREFIX_BYTES (plus the total
+    size) inside the worker - callers only need the hash. URLs seen with an
+    ETag before are revalidated with If-None-Match instead.
+    Network errors propagate; validate_in_order counts them as misses.
+    """
     url, metadata, custom_session, min_bytes = args
     s = custom_session or session
-    try:
-        r = s.get(url, timeout=TIMEOUT)
-        if r.status_code == 200 and r.content and len(r.content) > min_bytes:
-            content_type = r.headers.get("Content-Type", "").lower()
-            if "image" in content_type or len(r.content) > 20000:
-                return (url, True, r.content, sha1_hash(r.content), metadata)
-        return (url, False, None, None, metadata)
-    except Exception:
-        return (url, False, None, None, metadata)
+    headers = HASH_RANGE
+    known = url_etag_cache.get(url)
+    if known:
+        # Revalidation - a conditional GET answers in one header round trip
+        headers = {**HASH_RANGE, "If-None-Match": known[0]}
+    else:
+        verdict = probe_head(url, s, min_bytes)
+        if not verdict:
+            return Hit(url, False, metadata=metadata)
+        if verdict is not True:
+            return Hit(url, True, hash=verdict, metadata=metadata)
+    # Only the dedup prefix is downloaded - the API returns URLs, not bodies
+    r = s.get(url, timeout=TIMEOUT, headers=headers)
+    if known and r.status_code == 304:
+        return Hit(url, True, hash=known[1], metadata=metadata)
+    if r.status_code not in (200, 206):
+        raise_unless_miss(r.status_code)
+        return Hit(url, False, metadata=metadata)
+    size = body_size(r)
+    if r.content and size > min_bytes:
+        content_type = r.headers.get("Content-Type", "").lower()
+        if "image" in content_type or size > UNTYPED_MIN_BYTES:
+            img_hash = prefix_hash(r.content, size)
+            etag = r.headers.get("ETag")
+            if etag:
+                url_etag_cache.set(url, (etag, img_hash))
+            return Hit(url, True, hash=img_hash, metadata=metadata)
+    return Hit(url, False, metadata=metadata)
+
+def validate_in_order(fn, args_list, max_images):
+    """
+    Run fn (-> Hit) over args_list on the shared executor, submitting in
+    priority order with at most MAX_VALIDATION_WORKERS in flight.
+    Stops as soon as the completed prefix holds max_images distinct hashes -
+    later candidates can no longer change the answer, so they are never sent.
+    args_list may be a generator: it is consumed lazily, one window at a
+    time, so candidates past the early exit are never even built.
+    Returns the first max_images unique valid Hits, in args_list order.
+    """
+    if max_images <= 0:
+        return []
+    candidates = iter(args_list)
+    hits = {}  # index -> Hit, False = worker raised
+    picked = []
+    seen_hashes = set()
+    pending = {}
+    next_idx = 0
+    done_upto = 0  # candidates before done_upto are complete and already scanned
+
+    while True:
+        for args in islice(candidates, MAX_VALIDATION_WORKERS - len(pending)):
+            pending[validation_executor.submit(fn, args)] = next_idx
+            next_idx += 1
+        if not pending:
+            return picked
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            idx = pending.pop(future)
+            try:
+                hits[idx] = future.result()
+            except Exception:
+                hits[idx] = False
+        while done_upto in hits:
+            hit = hits.pop(done_upto)
+            done_upto += 1
+            if hit and hit.valid and hit.hash and hit.hash not in seen_hashes:
+                seen_hashes.add(hit.hash)
+                picked.append(hit)
+                if len(picked) >= max_images:
+                    # Drop probes still queued behind other requests -
+                    # ones already running just finish into the URL caches
+                    for future in pending:
+                        future.cancel()
+                    return picked
+
+def image_entries(hits, name, ext=""):
+    """
+    Response image dicts for hits: url, metadata, 1-based index and
+    "<name>-<n><ext>" filename - each dict built in one go, never grown.
+    """
+    return [{"url": hit.url, **hit.metadata, "index": n, "filename": f"{name}-{n}{ext}"}
+            for n, hit in enumerate(hits, 1)]
 
 def validate_urls_parallel(url_metadata_list, custom_session=None, min_bytes=MIN_BYTES, max_images=5):
     """
     Validate multiple URLs in parallel.
-    url_metadata_list: list of (url, metadata_dict) tuples
-    Returns: list of valid image dicts with url and metadata
+    url_metadata_list: iterable of (url, metadata_dict) tuples, most likely first
+    Returns: list of valid Hits, in candidate order
     """
-    if not url_metadata_list:
-        return []
-    
-    args_list = [(url, meta, custom_session, min_bytes) for url, meta in url_metadata_list]
-    url_order = {url: idx for idx, (url, _) in enumerate(url_metadata_list)}
-    results = []
-    
-    with ThreadPoolExecutor(max_workers=MAX_VALIDATION_WORKERS) as executor:
-        futures = [executor.submit(validate_single_url, args) for args in args_list]
-        for future in as_completed(futures):
-            try:
-                result = future.result()
-                if result[1]:  # is_valid
-                    results.append(result)
-            except:
-                pass
-    
-    # Sort by original order
-    results.sort(key=lambda x: url_order.get(x[0], 999))
-    
-    # Build final list with deduplication
-    images = []
-    seen_hashes = set()
-    
-    for url, is_valid, content, img_hash, metadata in results:
-        if len(images) >= max_images:
-            break
-        if img_hash and img_hash not in seen_hashes:
-            seen_hashes.add(img_hash)
-            img = {"url": url}
-            img.update(metadata)
-            images.append(img)
-    
-    return images
+    args_list = ((url, meta, custom_session, min_bytes) for url, meta in url_metadata_list)
+    return validate_in_order(validate_single_url, args_list, max_images)
 
 # ===================== ENDPOINTS =====================
+HEALTH_BODY = json_bytes({"status": "ok", "version": "optimized-parallel-v3"})
+
 @app.route('/health', methods=['GET'])
 def health():
-    return jsonify({"status": "ok", "version": "optimized-parallel-v3"})
+    return json_response(HEALTH_BODY)
 
 @app.route('/ping', methods=['GET'])
 def ping():
@@ -128,1333 +778,1164 @@ def ping():
 
 
 # ===================== BOSS / HUGO (PARALLEL) =====================
+BOSS_PREFIXES = ("hbeu", "hbna")
+# Model shots first, product shots (100s) last - probe order is answer order
+BOSS_MODEL_SUFFIXES = ("200", "245", "300", "340", "240", "210", "201", "230", "220", "250", "260", "270", "280",
+                       "350", "360")
+BOSS_PRODUCT_SUFFIXES = ("100", "110", "120", "130", "140", "150")
+BOSS_SUFFIX_ORDER = BOSS_MODEL_SUFFIXES + BOSS_PRODUCT_SUFFIXES
+BOSS_IMG_HOST = "https://images.hugoboss.com/is/image/boss"
+BOSS_IMG_PARAMS = "?$large$=&fit=crop,1&align=1,1&wid=1600"
+BOSS_URL_TMPL = BOSS_IMG_HOST + "/%s%s_%s_%s" + BOSS_IMG_PARAMS  # pref, num, color, suffix
+# Per suffix, its (pref, metadata) mirrors in fallback order - SKU independent, built once
+BOSS_CANDIDATES = tuple(tuple((pref, {"suffix": suf, "prefix": pref}) for pref in BOSS_PREFIXES)
+                        for suf in BOSS_SUFFIX_ORDER)
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def boss_url_list(num, color):
+    """
+    BOSS (num, color) -> per suffix, a tuple of ((url, metadata), ...) over
+    the CDN prefixes in fallback order. Suffixes in probe order.
+    Cached per SKU - returned tuples/dicts are shared, do not mutate.
+    """
+    return tuple(tuple((BOSS_URL_TMPL % (meta["prefix"], num, color, meta["suffix"]), meta)
+                       for _, meta in mirrors)
+                 for mirrors in BOSS_CANDIDATES)
+
+def validate_boss_suffix(mirrors):
+    """
+    One BOSS suffix: hbeu first, hbna only if hbeu has no image. The mirrors
+    serve the same asset, so probing hbna after an hbeu hit is pure waste.
+    """
+    last = len(mirrors) - 1
+    for i, (url, meta) in enumerate(mirrors):
+        try:
+            hit = validate_single_url((url, meta, None, MIN_BYTES))
+        except Exception:
+            if i == last:
+                raise
+            continue
+        if hit.valid:
+            return hit
+    return hit
+
+
 @app.route('/scrape-boss', methods=['POST'])
 @app.route('/scrape-hugo', methods=['POST'])
-def scrape_boss():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_boss(sku, max_images):
     """BOSS / HUGO - isti scraper, 21 pozicija × 2 prefiksa - PARALLEL"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        
-        parts = sku.replace("HB", "").strip().split()
-        if len(parts) < 2:
-            return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
-        
-        num, color = parts[0], parts[-1]
-        formatted_sku = f"HB{num} {color}"
-        
-        PREFIXES = ["hbeu", "hbna"]
-        SUFFIX_ORDER = ["200", "245", "300", "340", "240", "210", "201", "230", "220", "250", "260", "270", "280",
-                        "100", "110", "120", "130", "140", "150", "350", "360"]
-        IMG_HOST = "https://images.hugoboss.com/is/image/boss"
-        
-        # Build all URLs
-        url_list = []
-        for pref in PREFIXES:
-            for suf in SUFFIX_ORDER:
-                url = f"{IMG_HOST}/{pref}{num}_{color}_{suf}?$large$=&fit=crop,1&align=1,1&wid=1600"
-                url_list.append((url, {"suffix": suf, "prefix": pref}))
-        
-        # Validate in parallel
-        images = validate_urls_parallel(url_list, max_images=max_images + 5)
-        
-        # Reorder: model shots first, product shots (100s) last
-        model_shots = [img for img in images if not img.get("suffix", "").startswith("1")]
-        product_shots = [img for img in images if img.get("suffix", "").startswith("1")]
-        images = (model_shots + product_shots)[:max_images]
-        
-        for idx, img in enumerate(images):
-            img["index"] = idx + 1
-            img["filename"] = f"{formatted_sku}-{idx + 1}"
-        
-        return jsonify({"sku": sku, "formatted_sku": formatted_sku, "images": images, "count": len(images)})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    parts = sku.removeprefix("HB").strip().split()
+    if len(parts) < 2:
+        return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
+    
+    num, color = parts[0], parts[-1]
+    formatted_sku = f"HB{num} {color}"
+    url_list = boss_url_list(num, color)
+    
+    # Validate suffixes in parallel, each falling back across prefixes -
+    # suffixes are probed model shots first, so hits are already in answer order
+    hits = validate_in_order(validate_boss_suffix, url_list, max_images)
+    
+    images = image_entries(hits, formatted_sku)
+    
+    return jsonify({"sku": sku, "formatted_sku": formatted_sku, "images": images, "count": len(images)})
 
 
 # ===================== MAJE (PARALLEL) =====================
+MAJE_BASE_URL = "https://ca.maje.com/dw/image/v2/AAON_PRD/on/demandware.static/-/Sites-maje-master-catalog/default/"
+MAJE_MODEL_TMPL = MAJE_BASE_URL + "images/hi-res/Maje_%s_F_%d.jpg?sw=1520&sh=2000"  # code, position
+MAJE_PACK_TMPL = MAJE_BASE_URL + "images/packshot/Maje_%s_F_P.jpg?sw=1520&sh=2000"  # code
+MAJE_MODEL_META = tuple({"type": "model", "position": i} for i in range(1, 6))
+MAJE_PACK_META = {"type": "packshot", "position": 6}
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def maje_url_list(sku):
+    """
+    MAJE SKU -> 5 model shots + packshot, in probe order.
+    Cached per SKU - returned tuples/dicts are shared, do not mutate.
+    """
+    code = sku.removeprefix("MA")
+    return (*((MAJE_MODEL_TMPL % (code, meta["position"]), meta) for meta in MAJE_MODEL_META),
+            (MAJE_PACK_TMPL % code, MAJE_PACK_META))
+
+
 @app.route('/scrape-maje', methods=['POST'])
-def scrape_maje():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_maje(sku, max_images):
     """MAJE - PARALLEL validation"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        
-        base_code = sku.replace("MA", "")
-        file_prefix = f"Maje_{base_code}"
-        base_url = "https://ca.maje.com/dw/image/v2/AAON_PRD/on/demandware.static/-/Sites-maje-master-catalog/default/"
-        
-        # Build all URLs
-        url_list = []
-        for i in range(1, 6):
-            url = f"{base_url}images/hi-res/{file_prefix}_F_{i}.jpg?sw=1520&sh=2000"
-            url_list.append((url, {"type": "model", "position": i}))
-        
-        # Packshot
-        url = f"{base_url}images/packshot/{file_prefix}_F_P.jpg?sw=1520&sh=2000"
-        url_list.append((url, {"type": "packshot", "position": 6}))
-        
-        # Validate in parallel
-        images = validate_urls_parallel(url_list, max_images=max_images)
-        
-        for idx, img in enumerate(images):
-            img["index"] = idx + 1
-            img["filename"] = f"{sku}-{idx + 1}"
-        
-        return jsonify({"sku": sku, "formatted_sku": sku, "images": images, "count": len(images)})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    url_list = maje_url_list(sku)
+    
+    # Validate in parallel
+    hits = validate_urls_parallel(url_list, max_images=max_images)
+    
+    images = image_entries(hits, sku)
+    
+    return jsonify({"sku": sku, "formatted_sku": sku, "images": images, "count": len(images)})
 
 
 # ===================== MANGO (BASE64 + PARALLEL) =====================
+MANGO_BASE_IMG = "https://shop.mango.com/assets/rcs/pics/static/T2/fotos"
+# Force JPEG format output to avoid AVIF (which Modal can't process)
+MANGO_IMG_PARAM = "?imwidth=2048&imdensity=1&imformat=jpeg"
+# Order: Main, Outfit, R, D1 (detail), B (packshot as 5th), then extra details
+MANGO_TEMPLATES = (
+    f"{MANGO_BASE_IMG}/S/{{code}}.jpg{MANGO_IMG_PARAM}",                        # 1. Main
+    *(f"{MANGO_BASE_IMG}/outfit/S/{{code}}-99999999_{i:02}.jpg{MANGO_IMG_PARAM}"
+      for i in range(1, 5)),                                                   # 2. Outfit
+    f"{MANGO_BASE_IMG}/S/{{code}}_R.jpg{MANGO_IMG_PARAM}",                      # 3. R (rear)
+    f"{MANGO_BASE_IMG}/S/{{code}}_D1.jpg{MANGO_IMG_PARAM}",                     # 4. D1 (detail)
+    f"{MANGO_BASE_IMG}/S/{{code}}_B.jpg{MANGO_IMG_PARAM}",                      # 5. B (packshot)
+    *(f"{MANGO_BASE_IMG}/S/{{code}}_D{d}.jpg{MANGO_IMG_PARAM}" for d in range(2, 13)),
+)
+
+def parse_mango_sku(sku):
+    """MNG87054767-99 -> ("87054767", "99"), None if malformed - slicing, no regex"""
+    if sku[:3].upper() != "MNG":
+        return None
+    number, sep, color = sku[3:].partition("-")
+    if not (sep and number.isascii() and number.isdigit() and color.isascii() and color.isalnum()):
+        return None
+    return number, color
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def mango_url_list(their_code):
+    """
+    MANGO code (87054767_99) -> (url, candidate index) pairs, in probe order.
+    Cached per SKU - returned tuples/dicts are shared, do not mutate.
+    """
+    return tuple((tmpl.format(code=their_code), idx) for idx, tmpl in enumerate(MANGO_TEMPLATES))
+
+def mango_image_body(r):
+    """JPEG/PNG body of a MANGO response, or None (missing, too small, AVIF/WebP)"""
+    if r.status_code != 200 or not r.content or len(r.content) <= MIN_BYTES:
+        return None
+    content_type = r.headers.get("Content-Type", "").lower()
+    # REJECT AVIF - Modal cannot process AVIF format
+    if "avif" in content_type or "webp" in content_type:
+        return None
+    # Check file signature to reject AVIF/WebP that might be mislabeled
+    if len(r.content) > 12:
+        # AVIF: contains 'ftypavif' or 'ftypavis' in first 16 bytes
+        if b'ftyp' in r.content[:12] and (b'avif' in r.content[:16] or b'avis' in r.content[:16]):
+            return None
+        # WebP: starts with 'RIFF' and contains 'WEBP'
+        if r.content[:4] == b'RIFF' and b'WEBP' in r.content[:12]:
+            return None
+    # Verify it's JPEG (FF D8 FF) or PNG (89 50 4E 47)
+    is_jpeg = r.content[:3] == b'\xff\xd8\xff'
+    is_png = r.content[:4] == b'\x89PNG'
+    if not (is_jpeg or is_png) or "image" not in content_type:
+        return None
+    return r.content
+
+
 @app.route('/scrape-mango', methods=['POST'])
-def scrape_mango():
+@response_cache(mango_response_cache)
+@sku_endpoint
+def scrape_mango(sku, max_images):
     """MANGO - Downloads images and returns BASE64 (site blocks direct access)"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        
-        m = re.match(r"MNG(\d+)-([A-Z0-9]+)$", sku, re.I)
-        if not m:
-            return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
-        
-        number, color = m.group(1), m.group(2)
-        their_code = f"{number}_{color}"
-        
-        BASE_IMG = "https://shop.mango.com/assets/rcs/pics/static/T2/fotos"
-        # Force JPEG format output to avoid AVIF (which Modal can't process)
-        IMG_PARAM = "?imwidth=2048&imdensity=1&imformat=jpeg"
-        
-        # Build candidate URLs
-        # Order: Main, Outfit, R, D1 (detail), B (packshot as 5th)
-        candidate_urls = []
-        candidate_urls.append(f"{BASE_IMG}/S/{their_code}.jpg{IMG_PARAM}")           # 1. Main
-        for i in range(1, 5):
-            candidate_urls.append(f"{BASE_IMG}/outfit/S/{their_code}-99999999_{i:02}.jpg{IMG_PARAM}")  # 2. Outfit
-        candidate_urls.append(f"{BASE_IMG}/S/{their_code}_R.jpg{IMG_PARAM}")         # 3. R (rear)
-        candidate_urls.append(f"{BASE_IMG}/S/{their_code}_D1.jpg{IMG_PARAM}")        # 4. D1 (detail)
-        candidate_urls.append(f"{BASE_IMG}/S/{their_code}_B.jpg{IMG_PARAM}")         # 5. B (packshot)
-        # Additional details if needed
-        for d in range(2, 13):
-            candidate_urls.append(f"{BASE_IMG}/S/{their_code}_D{d}.jpg{IMG_PARAM}")
-        
-        # Create session with Mango headers
-        # IMPORTANT: Request JPEG/PNG only, explicitly reject AVIF/WebP (Modal can't process them)
-        mango_session = make_session({
-            "Accept": "image/jpeg,image/png;q=0.9,image/*;q=0.1",
-            "Referer": "https://shop.mango.com/",
-            "Accept-Language": "en-US,en;q=0.9"
-        })
-        
-        # Download and validate images in parallel, return base64
-        def download_mango_image(args):
-            url, idx = args
-            try:
-                r = mango_session.get(url, timeout=TIMEOUT)
-                if r.status_code == 200 and r.content and len(r.content) > MIN_BYTES:
-                    content_type = r.headers.get("Content-Type", "").lower()
-                    # REJECT AVIF - Modal cannot process AVIF format
-                    if "avif" in content_type or "webp" in content_type:
-                        return (url, False, None, None, idx)
-                    # Check file signature to reject AVIF/WebP that might be mislabeled
-                    if len(r.content) > 12:
-                        # AVIF: contains 'ftypavif' or 'ftypavis' in first 16 bytes
-                        if b'ftyp' in r.content[:12] and (b'avif' in r.content[:16] or b'avis' in r.content[:16]):
-                            return (url, False, None, None, idx)
-                        # WebP: starts with 'RIFF' and contains 'WEBP'
-                        if r.content[:4] == b'RIFF' and b'WEBP' in r.content[:12]:
-                            return (url, False, None, None, idx)
-                    # Verify it's JPEG (FF D8 FF) or PNG (89 50 4E 47)
-                    is_jpeg = r.content[:3] == b'\xff\xd8\xff'
-                    is_png = r.content[:4] == b'\x89PNG'
-                    if not (is_jpeg or is_png):
-                        return (url, False, None, None, idx)
-                    if "image" in content_type:
-                        img_hash = sha1_hash(r.content)
-                        b64 = base64.b64encode(r.content).decode('utf-8')
-                        return (url, True, b64, img_hash, idx)
-            except:
-                pass
-            return (url, False, None, None, idx)
-        
-        # Parallel download
-        images = []
-        seen_hashes = set()
-        
-        args_list = [(url, idx) for idx, url in enumerate(candidate_urls)]
-        
-        with ThreadPoolExecutor(max_workers=MAX_VALIDATION_WORKERS) as executor:
-            futures = [executor.submit(download_mango_image, args) for args in args_list]
-            results = []
-            for future in as_completed(futures):
-                try:
-                    result = future.result()
-                    if result[1]:  # is_valid
-                        results.append(result)
-                except:
-                    pass
-        
-        # Sort by original order
-        results.sort(key=lambda x: x[4])
-        
-        # Build final list
-        for url, is_valid, b64_data, img_hash, idx in results:
-            if len(images) >= max_images:
-                break
-            if img_hash and img_hash not in seen_hashes:
-                seen_hashes.add(img_hash)
-                images.append({
-                    "url": url,
-                    "base64": b64_data,
-                    "index": len(images) + 1,
-                    "filename": f"{sku}-{len(images) + 1}"
-                })
-        
-        return jsonify({
-            "sku": sku,
-            "formatted_sku": sku,
-            "their_code": their_code,
-            "images": images,
-            "count": len(images),
-            "note": "Images returned as base64"
-        })
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    parsed = parse_mango_sku(sku)
+    if parsed is None:
+        return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
+    
+    number, color = parsed
+    their_code = f"{number}_{color}"
+    
+    # Download and validate images in parallel, return base64
+    def download_mango_image(args):
+        url, idx = args
+        if url_miss_cache.get(url):
+            return Hit(url, False, metadata=idx)
+        try:
+            r = mango_session.get(url, timeout=TIMEOUT)
+        except Exception:
+            return Hit(url, False, metadata=idx)  # network error - not cached, retried next time
+        if r.status_code != 200 and r.status_code not in MISS_STATUSES:
+            return Hit(url, False, metadata=idx)  # bot wall (403), 5xx - not cached either
+        body = mango_image_body(r)
+        if body is None:
+            # Missing detail shots (D2..D12) are the common case - skip them next time
+            url_miss_cache.set(url, True)
+            return Hit(url, False, metadata=idx)
+        img_hash = content_hash(body)
+        b64 = base64.b64encode(body).decode('utf-8')
+        return Hit(url, True, b64, img_hash, idx)
+    
+    # Parallel download, in candidate order
+    hits = validate_in_order(download_mango_image, mango_url_list(their_code), max_images)
+    
+    # Build final list
+    images = [{"url": hit.url, "base64": hit.content, "index": n, "filename": f"{sku}-{n}"}
+              for n, hit in enumerate(hits, 1)]
+    
+    return jsonify({
+        "sku": sku,
+        "formatted_sku": sku,
+        "their_code": their_code,
+        "images": images,
+        "count": len(images),
+        "note": "Images returned as base64"
+    })
 
 
 # ===================== TOMMY HILFIGER (PARALLEL) =====================
+TOMMY_IMG_HOST = "https://tommy-europe.scene7.com/is/image/TommyEurope/"
+TOMMY_IMG_PARAMS = "?wid=781&fmt=jpeg&qlt=95%2C1&op_sharpen=0&resMode=sharp2&op_usm=1.5%2C.5%2C0%2C0&iccEmbed=0&printRes=72"
+TOMMY_SUFFIXES = ("main", "alternate1", "alternate2", "alternate3", "alternate4")
+# Per suffix, the URL part after the code (params contain %2C, so no %-template)
+TOMMY_CANDIDATES = tuple((f"_{suffix}{TOMMY_IMG_PARAMS}", {"suffix": suffix}) for suffix in TOMMY_SUFFIXES)
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def tommy_url_list(formatted_code):
+    """
+    TOMMY code (MW0MW12345_BDS) -> main + 4 alternates, in probe order.
+    Cached per SKU - returned tuples/dicts are shared, do not mutate.
+    """
+    head = TOMMY_IMG_HOST + formatted_code
+    return tuple((head + tail, meta) for tail, meta in TOMMY_CANDIDATES)
+
 @app.route('/scrape-tommy', methods=['POST'])
-def scrape_tommy():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_tommy(sku, max_images):
     """TOMMY HILFIGER - PARALLEL validation"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        
-        base_code = sku.replace("TH", "")
-        formatted_code = base_code.replace("-", "_")
-        formatted_sku = f"TH{base_code}"
-        
-        base_url = "https://tommy-europe.scene7.com/is/image/TommyEurope"
-        params = "?wid=781&fmt=jpeg&qlt=95%2C1&op_sharpen=0&resMode=sharp2&op_usm=1.5%2C.5%2C0%2C0&iccEmbed=0&printRes=72"
-        
-        suffixes = ["main", "alternate1", "alternate2", "alternate3", "alternate4"]
-        
-        # Build all URLs
-        url_list = [(f"{base_url}/{formatted_code}_{suffix}{params}", {"suffix": suffix}) for suffix in suffixes]
-        
-        # Validate in parallel
-        images = validate_urls_parallel(url_list, max_images=max_images)
-        
-        for idx, img in enumerate(images):
-            img["index"] = idx + 1
-            img["filename"] = f"{formatted_sku}-{idx + 1}"
-        
-        return jsonify({"sku": sku, "formatted_sku": formatted_sku, "images": images, "count": len(images)})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    base_code = sku.removeprefix("TH")
+    formatted_code = base_code.replace("-", "_")
+    formatted_sku = f"TH{base_code}"
+    
+    url_list = tommy_url_list(formatted_code)
+    
+    # Validate in parallel
+    hits = validate_urls_parallel(url_list, max_images=max_images)
+    
+    images = image_entries(hits, formatted_sku)
+    
+    return jsonify({"sku": sku, "formatted_sku": formatted_sku, "images": images, "count": len(images)})
 
 
 # ===================== ALL SAINTS (PARALLEL) =====================
+MIN_AS = 20000
+# Cloudinary list filter picking the asset tagged with a gallery position -
+# variant 1 = sfcc-gallery-position, variant 2 = sfcc_pdp_gallery_position_prod
+AS_FILTER_HEAD = ("fn_select:jq:first%28.%5B%5D%7Cif%20has%28%22metadata%22%29%20then%20"
+                  "select%28any%28.metadata%5B%5D%3B%20.external_id%20%3D%3D%20")
+AS_FILTER_KEYS = {1: "%22sfcc-gallery-position%22", 2: "%22sfcc_pdp_gallery_position_prod%22"}
+AS_URL_TMPL = ("https://media.i.allsaints.com/image/list/" + AS_FILTER_HEAD
+               + "{key}%20and%20.value%20%3D%3D%20{pos}%29%29%20else%20empty%20end%29"
+               + "/f_auto,q_auto,dpr_auto,w_1674,h_2092,c_fit/")
+AS_URL_TAIL = ".json?_i=AG"
+# 10 positions x 2 metadata variants, in probe order - everything up to the
+# code is SKU independent, so only "head + code + tail" is left per SKU
+AS_CANDIDATES = tuple((AS_URL_TMPL.format(key=AS_FILTER_KEYS[variant], pos=pos),
+                       {"position": pos, "variant": variant})
+                      for pos in range(1, 11) for variant in (1, 2))
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def allsaints_url_list(their_code):
+    """
+    ALL SAINTS code -> 10 positions x 2 metadata variants, in probe order.
+    Cached per SKU - returned tuples/dicts are shared, do not mutate.
+    """
+    tail = their_code + AS_URL_TAIL
+    return tuple((head + tail, meta) for head, meta in AS_CANDIDATES)
+
+
 @app.route('/scrape-allsaints', methods=['POST'])
-def scrape_allsaints():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_allsaints(sku, max_images):
     """ALL SAINTS - PARALLEL validation"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        
-        if sku.startswith("ASM") or sku.startswith("ASW"):
-            their_code = sku[2:]
-        else:
-            their_code = sku
-        their_code = re.sub(r"\s+", "-", their_code.strip())
-        
-        as_session = make_session({
-            "Accept": "image/jpeg,image/*;q=0.8",
-            "Referer": "https://www.allsaints.com/"
-        })
-        
-        MIN_AS = 20000
-        
-        def make_url(code, pos, variant):
-            if variant == 1:
-                filt = ("fn_select:jq:first%28.%5B%5D%7Cif%20has%28%22metadata%22%29%20then%20"
-                        "select%28any%28.metadata%5B%5D%3B%20.external_id%20%3D%3D%20"
-                        f"%22sfcc-gallery-position%22%20and%20.value%20%3D%3D%20{pos}%29%29%20else%20empty%20end%29")
-            else:
-                filt = ("fn_select:jq:first%28.%5B%5D%7Cif%20has%28%22metadata%22%29%20then%20"
-                        "select%28any%28.metadata%5B%5D%3B%20.external_id%20%3D%3D%20"
-                        f"%22sfcc_pdp_gallery_position_prod%22%20and%20.value%20%3D%3D%20{pos}%29%29%20else%20empty%20end%29")
-            return f"https://media.i.allsaints.com/image/list/{filt}/f_auto,q_auto,dpr_auto,w_1674,h_2092,c_fit/{code}.json?_i=AG"
-        
-        # Build all URLs
-        url_list = []
-        for pos in range(1, 11):
-            for variant in (1, 2):
-                url = make_url(their_code, pos, variant)
-                url_list.append((url, {"position": pos, "variant": variant}))
-        
-        # Validate in parallel
-        images = validate_urls_parallel(url_list, custom_session=as_session, min_bytes=MIN_AS, max_images=max_images)
-        
-        for idx, img in enumerate(images):
-            img["index"] = idx + 1
-            img["filename"] = f"{sku}-{idx + 1}"
-        
-        return jsonify({"sku": sku, "formatted_sku": sku, "their_code": their_code, "images": images, "count": len(images)})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    if sku.startswith("ASM") or sku.startswith("ASW"):
+        their_code = sku[2:]
+    else:
+        their_code = sku
+    their_code = WHITESPACE_RE.sub("-", their_code.strip())
+    url_list = allsaints_url_list(their_code)
+    
+    # Validate in parallel
+    hits = validate_urls_parallel(url_list, custom_session=allsaints_session, min_bytes=MIN_AS, max_images=max_images)
+    
+    images = image_entries(hits, sku)
+    
+    return jsonify({"sku": sku, "formatted_sku": sku, "their_code": their_code, "images": images, "count": len(images)})
 
 
 # ===================== BOGGI MILANO (NO VALIDATION - fast) =====================
+BOGGI_BASE_IMG = (
+    "https://ecdn.speedsize.com/90526ea8-ead7-46cf-ba09-f3be94be750a/"
+    "www.boggi.com/dw/image/v2/BBBS_PRD/on/demandware.static/-/"
+    "Sites-BoggiCatalog/default/images/hi-res/"
+)
+BOGGI_MAIN_TMPL = BOGGI_BASE_IMG + "%s.jpeg"  # model
+BOGGI_ALT_TMPL = BOGGI_BASE_IMG + "%s_%d.jpeg"  # model, shot
+
 @app.route('/scrape-boggi', methods=['POST'])
-def scrape_boggi():
+@sku_endpoint
+def scrape_boggi(sku, max_images):
     """BOGGI MILANO - NO VALIDATION (n8n filters)"""
-    try:
-        data = request.json
-        sku = data.get("sku", "").strip()
-        max_images = data.get("max_images", 5)
+    model_code, sep, color_code = sku.partition("-")
+    if not sep:
+        return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
 
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-
-        if "-" not in sku:
-            return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
-
-        model_code, color_code = sku.split("-", 1)
-
-        BASE_IMG = (
-            "https://ecdn.speedsize.com/90526ea8-ead7-46cf-ba09-f3be94be750a/"
-            "www.boggi.com/dw/image/v2/BBBS_PRD/on/demandware.static/-/"
-            "Sites-BoggiCatalog/default/images/hi-res/"
-        )
-
-        images = []
-        for i in range(0, max_images):
-            if i == 0:
-                file_part = f"{model_code}.jpeg"
-            else:
-                file_part = f"{model_code}_{i}.jpeg"
-            url = BASE_IMG + file_part
-            images.append({"url": url, "index": i + 1, "filename": f"{sku}-{i + 1}"})
-
-        return jsonify({
-            "sku": sku,
-            "formatted_sku": sku,
-            "model_code": model_code,
-            "color_code": color_code,
-            "landing_page": "empty",
-            "images": images,
-            "count": len(images),
-            "note": "No validation – n8n filters invalid images"
-        })
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    # Main shot is <model>.jpeg, the rest <model>_<i>.jpeg
+    images = [{"url": BOGGI_ALT_TMPL % (model_code, i) if i else BOGGI_MAIN_TMPL % model_code,
+               "index": i + 1, "filename": f"{sku}-{i + 1}"}
+              for i in range(max_images)]
+
+    return jsonify({
+        "sku": sku,
+        "formatted_sku": sku,
+        "model_code": model_code,
+        "color_code": color_code,
+        "landing_page": "empty",
+        "images": images,
+        "count": len(images),
+        "note": "No validation – n8n filters invalid images"
+    })
 
 
 # ===================== DSQUARED2 =====================
 @app.route('/scrape-dsquared2', methods=['POST'])
-def scrape_dsquared2_endpoint():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_dsquared2_endpoint(sku, max_images):
     """DSQUARED2 - uses scrapers/dsquared2.py module"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        validate = data.get('validate', False)
-        
-        if not sku:
-            return jsonify({"error": "SKU required", "sku": sku, "images": []}), 400
-        
-        result = dsquared2.scrape(sku, max_images, validate)
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({"error": str(e), "sku": "", "images": []}), 500
+    validate = scrape_request().validate_or(False)
+    
+    result = dsquared2.scrape(sku, max_images, validate)
+    return jsonify(result)
 
 
 # ===================== EMPORIO ARMANI =====================
 @app.route('/scrape-emporio-armani', methods=['POST'])
-def scrape_emporio_armani_endpoint():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_emporio_armani_endpoint(sku, max_images):
     """EMPORIO ARMANI - uses scrapers/emporio_armani.py module"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        validate = data.get('validate', False)
-
-        if not sku:
-            return jsonify({"error": "SKU required", "sku": sku, "images": []}), 400
+    validate = scrape_request().validate_or(False)
 
-        result = emporio_armani.scrape(sku, max_images, validate)
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({"error": str(e), "sku": "", "images": []}), 500
+    result = emporio_armani.scrape(sku, max_images, validate)
+    return jsonify(result)
 
 
 # ===================== CALVIN KLEIN (PARALLEL) =====================
+CK_SUFFIXES = ("main", "alternate1", "alternate2", "alternate3", "alternate4")
+CK_IMG_BASE = "https://calvinklein-eu.scene7.com/is/image/CalvinKleinEU/"
+
 @app.route('/scrape-calvin-klein', methods=['POST'])
-def scrape_calvin_klein():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_calvin_klein(sku, max_images):
     """CALVIN KLEIN - 5 pozicija - PARALLEL"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        
-        base_code = sku.replace("CK", "")
-        formatted_code = base_code.replace("-", "_")
-        
-        BASE = "https://calvinklein-eu.scene7.com/is/image/CalvinKleinEU/"
-        SUFFIXES = ["main", "alternate1", "alternate2", "alternate3", "alternate4"]
-        
-        # Build all URLs
-        url_list = [(f"{BASE}{formatted_code}_{suffix}?wid=1600&fmt=jpeg&qlt=95", {"suffix": suffix}) for suffix in SUFFIXES]
-        
-        # Validate in parallel
-        images = validate_urls_parallel(url_list, max_images=max_images)
-        
-        for idx, img in enumerate(images):
-            img["index"] = idx + 1
-            img["filename"] = f"{sku}-{idx + 1}"
-        
-        return jsonify({"sku": sku, "brand_code": formatted_code, "images": images, "count": len(images)})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    base_code = sku.removeprefix("CK")
+    formatted_code = base_code.replace("-", "_")
+    
+    # Build all URLs
+    url_list = [(f"{CK_IMG_BASE}{formatted_code}_{suffix}?wid=1600&fmt=jpeg&qlt=95", {"suffix": suffix}) for suffix in CK_SUFFIXES]
+    
+    # Validate in parallel
+    hits = validate_urls_parallel(url_list, max_images=max_images)
+    
+    images = image_entries(hits, sku)
+    
+    return jsonify({"sku": sku, "brand_code": formatted_code, "images": images, "count": len(images)})
 
 
 # ===================== COACH =====================
 @app.route('/scrape-coach', methods=['POST'])
-def scrape_coach_endpoint():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_coach_endpoint(sku, max_images):
     """COACH - uses scrapers/scrape_coach.py module"""
-    try:
-        from scrapers.scrape_coach import scrape_coach
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        result = scrape_coach(sku, max_images)
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    if coach is None:
+        return jsonify({"error": "Coach scraper module not found"}), 500
+
+    result = coach.scrape_coach(sku, max_images)
+    return jsonify(result)
 
 
 # ===================== DIESEL =====================
+DIESEL_VIEWS = ("C", "E", "F", "I", "B", "D", "A", "G", "H")
+DIESEL_IMG_BASE = "https://shop.diesel.com/dw/image/v2/BBLG_PRD/on/demandware.static/-/Sites-diesel-master-catalog/default/images/large"
+
 from scrapers import diesel
 
 @app.route('/scrape-diesel', methods=['POST'])
-def scrape_diesel():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_diesel(sku, max_images):
     """DIESEL - PARALLEL with correct view suffixes"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip().upper()
-        max_images = data.get('max_images', 5)
-
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-
-        # Parse SKU: DSA06268 0AFAA 100 → A06268_0AFAA_100
-        parts = sku.replace("-", " ").split()
-        if len(parts) < 3:
-            return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
-
-        # Convert prefix: DSA→A, DSX→X, DSY→Y
-        first_part = parts[0]
-        if first_part.startswith("DS"):
-            prefix_map = {"DSA": "A", "DSX": "X", "DSY": "Y"}
-            prefix = first_part[:3]
-            if prefix in prefix_map:
-                first_part = prefix_map[prefix] + first_part[3:]
-            else:
-                first_part = first_part[2:]  # Just remove DS
-
-        code = f"{first_part}_{parts[1]}_{parts[2]}"
-
-        BASE = "https://shop.diesel.com/dw/image/v2/BBLG_PRD/on/demandware.static/-/Sites-diesel-master-catalog/default/images/large"
-        VIEWS = ["C", "E", "F", "I", "B", "D", "A", "G", "H"]
+    sku = sku.upper()
+
+    # Parse SKU: DSA06268 0AFAA 100 → A06268_0AFAA_100
+    parts = sku.replace("-", " ").split()
+    if len(parts) < 3:
+        return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
+
+    # Convert prefix: DSA→A, DSX→X, DSY→Y
+    first_part = parts[0]
+    if first_part.startswith("DS"):
+        prefix_map = {"DSA": "A", "DSX": "X", "DSY": "Y"}
+        prefix = first_part[:3]
+        if prefix in prefix_map:
+            first_part = prefix_map[prefix] + first_part[3:]
+        else:
+            first_part = first_part[2:]  # Just remove DS
 
-        # Build all URLs
-        url_list = [(f"{BASE}/{code}_{view}.jpg?sw=1200&sh=1600&sm=fit", {"view": view}) for view in VIEWS]
+    code = f"{first_part}_{parts[1]}_{parts[2]}"
 
-        # Validate in parallel with 20KB minimum
-        images = validate_urls_parallel(url_list, min_bytes=20000, max_images=max_images)
+    # Build all URLs
+    url_list = [(f"{DIESEL_IMG_BASE}/{code}_{view}.jpg?sw=1200&sh=1600&sm=fit", {"view": view}) for view in DIESEL_VIEWS]
 
-        for idx, img in enumerate(images):
-            img["index"] = idx + 1
-            img["filename"] = f"{sku.replace(' ', '_')}-{idx + 1}.jpg"
+    # Validate in parallel with 20KB minimum
+    hits = validate_urls_parallel(url_list, min_bytes=20000, max_images=max_images)
 
-        return jsonify({"sku": sku, "brand_code": code, "images": images, "count": len(images)})
+    images = image_entries(hits, sku.replace(' ', '_'), ".jpg")
 
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return jsonify({"sku": sku, "brand_code": code, "images": images, "count": len(images)})
 
 
 # ===================== KURT GEIGER (PARALLEL) =====================
+KG_FRAMES = (20, 25, 21, 22, 23, 24, 26, 27, 28)
+
 @app.route('/scrape-kurt-geiger', methods=['POST'])
-def scrape_kurt_geiger():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_kurt_geiger(sku, max_images):
     """KURT GEIGER - 9 frames - PARALLEL"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        
-        nums = re.findall(r"\d+", sku)
-        if not nums:
-            return jsonify({"error": f"Cannot extract product ID from: {sku}"}), 400
-        
-        prod_id = max(nums, key=len)
-        
-        FRAMES = [20, 25, 21, 22, 23, 24, 26, 27, 28]
-        
-        # Build all URLs
-        url_list = [(f"https://media.global.kurtgeiger.com/product/{prod_id}/{frame}/{prod_id}?w=1920", {"frame": frame}) for frame in FRAMES]
-        
-        # Validate in parallel
-        images = validate_urls_parallel(url_list, min_bytes=4000, max_images=max_images)
-        
-        for idx, img in enumerate(images):
-            img["index"] = idx + 1
-            img["filename"] = f"{sku}-{idx + 1}"
-        
-        return jsonify({"sku": sku, "brand_code": prod_id, "images": images, "count": len(images)})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    nums = DIGITS_RE.findall(sku)
+    if not nums:
+        return jsonify({"error": f"Cannot extract product ID from: {sku}"}), 400
+    
+    prod_id = max(nums, key=len)
+    
+    # Build all URLs
+    url_list = [(f"https://media.global.kurtgeiger.com/product/{prod_id}/{frame}/{prod_id}?w=1920", {"frame": frame}) for frame in KG_FRAMES]
+    
+    # Validate in parallel
+    hits = validate_urls_parallel(url_list, min_bytes=4000, max_images=max_images)
+    
+    images = image_entries(hits, sku)
+    
+    return jsonify({"sku": sku, "brand_code": prod_id, "images": images, "count": len(images)})
 
 
 # ===================== KATE SPADE (PARALLEL) =====================
+KS_COLOR_MAP = {
+    "500": ("020", "500", "000"),
+    "001": ("001", "000", "020"),
+    "200": ("200", "020", "000"),
+}
+KS_FALLBACK_COLORS = ("020", "001", "000", "200", "500")
+KS_SUFFIXES = ("", "_1", "_2", "_3", "_4")
+KS_IMG_BASE = "https://katespade.scene7.com/is/image/KateSpade"
+
 @app.route('/scrape-kate-spade', methods=['POST'])
-def scrape_kate_spade():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_kate_spade(sku, max_images):
     """KATE SPADE - multi-color support - PARALLEL"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        
-        core = sku[2:] if sku.upper().startswith("KS") else sku
-        if "-" in core:
-            model, my_color = core.split("-", 1)
-        else:
-            model, my_color = core, ""
-        
-        COLOR_MAP = {
-            "500": ["020", "500", "000"],
-            "001": ["001", "000", "020"],
-            "200": ["200", "020", "000"],
-        }
-        FALLBACK_COLORS = ["020", "001", "000", "200", "500"]
-        
-        color_candidates = COLOR_MAP.get(my_color, []) + [c for c in FALLBACK_COLORS if c not in COLOR_MAP.get(my_color, [])]
-        
-        BASE = "https://katespade.scene7.com/is/image/KateSpade"
-        SUFFIXES = ["", "_1", "_2", "_3", "_4"]
-        
-        # Build all URLs for all color variants
-        url_list = []
-        for clr in color_candidates:
-            for suffix in SUFFIXES:
-                url = f"{BASE}/{model}_{clr}{suffix}?$desktopProductZoom$"
-                url_list.append((url, {"color": clr, "suffix": suffix}))
-        
-        # Validate in parallel
-        images = validate_urls_parallel(url_list, min_bytes=15000, max_images=max_images)
-        
-        for idx, img in enumerate(images):
-            img["index"] = idx + 1
-            img["filename"] = f"{sku}-{idx + 1}"
-        
-        working_color = images[0].get("color", "") if images else ""
-        return jsonify({"sku": sku, "brand_code": f"{model}_{working_color}", "images": images, "count": len(images)})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    core = sku[2:] if sku.upper().startswith("KS") else sku
+    if "-" in core:
+        model, my_color = core.split("-", 1)
+    else:
+        model, my_color = core, ""
+    
+    preferred = KS_COLOR_MAP.get(my_color, ())
+    color_candidates = [*preferred, *(c for c in KS_FALLBACK_COLORS if c not in preferred)]
+    
+    # All URLs for all color variants - lazily, most colors are never reached
+    url_list = ((f"{KS_IMG_BASE}/{model}_{clr}{suffix}?$desktopProductZoom$", {"color": clr, "suffix": suffix})
+                for clr in color_candidates for suffix in KS_SUFFIXES)
+    
+    # Validate in parallel
+    hits = validate_urls_parallel(url_list, min_bytes=15000, max_images=max_images)
+    
+    images = image_entries(hits, sku)
+    
+    working_color = images[0].get("color", "") if images else ""
+    return jsonify({"sku": sku, "brand_code": f"{model}_{working_color}", "images": images, "count": len(images)})
 
 
 # ===================== PAUL TAYLOR (PARALLEL) =====================
+PT_SEASONS = ("W25", "W24")
+PT_NUMS = ("1", "2", "3", "4", "5", "01", "02", "03", "04", "05")
+PT_IMG_BASE = "https://paultaylor.it/cdn/shop/files"
+
 @app.route('/scrape-paul-taylor', methods=['POST'])
-def scrape_paul_taylor():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_paul_taylor(sku, max_images):
     """PAUL TAYLOR - 2 sezone × 10 brojeva - PARALLEL"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip().upper()
-        max_images = data.get('max_images', 5)
-        
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        
-        their_base = None
-        
-        m = re.match(r"^PT7([A-Z]{2})([A-Z])(\d{3})-(\d{3})$", sku)
+    sku = sku.upper()
+    
+    their_base = None
+    
+    m = PT_ALPHA_RE.fullmatch(sku)
+    if m:
+        two, last, num, color = m.groups()
+        their_base = f"PT7{two}_{last}{num}_{color}"
+    
+    if not their_base:
+        m = PT_DIGIT_RE.fullmatch(sku)
         if m:
-            two, last, num, color = m.groups()
-            their_base = f"PT7{two}_{last}{num}_{color}"
-        
-        if not their_base:
-            m = re.match(r"^PT7(\d{2})(\d{4})-(\d{3})$", sku)
-            if m:
-                two, four, color = m.groups()
-                their_base = f"PT7{two}_{four}_{color}"
-        
-        if not their_base:
-            return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
-        
-        BASE = "https://paultaylor.it/cdn/shop/files"
-        SEASONS = ["W25", "W24"]
-        NUMS = ["1", "2", "3", "4", "5", "01", "02", "03", "04", "05"]
-        
-        # Build all URLs
-        url_list = []
-        for season in SEASONS:
-            for n in NUMS:
-                url = f"{BASE}/{their_base}_{season}_{n}.jpg"
-                url_list.append((url, {"season": season, "num": n}))
-        
-        # Validate in parallel
-        images = validate_urls_parallel(url_list, min_bytes=12000, max_images=max_images)
-        
-        for idx, img in enumerate(images):
-            img["index"] = idx + 1
-            img["filename"] = f"{sku}-{idx + 1}"
-        
-        return jsonify({"sku": sku, "brand_code": their_base, "images": images, "count": len(images)})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+            two, four, color = m.groups()
+            their_base = f"PT7{two}_{four}_{color}"
+    
+    if not their_base:
+        return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
+    
+    # Build all URLs
+    url_list = []
+    for season in PT_SEASONS:
+        for n in PT_NUMS:
+            url = f"{PT_IMG_BASE}/{their_base}_{season}_{n}.jpg"
+            url_list.append((url, {"season": season, "num": n}))
+    
+    # Validate in parallel
+    hits = validate_urls_parallel(url_list, min_bytes=12000, max_images=max_images)
+    
+    images = image_entries(hits, sku)
+    
+    return jsonify({"sku": sku, "brand_code": their_base, "images": images, "count": len(images)})
 
 
 # ===================== MOOSE KNUCKLES (PARALLEL) =====================
+MOOSE_SUFFIX_ORDER = (
+    "front", "front_category", "front_flat",
+    "back", "side", "left", "right",
+    "detail1", "detail_1", "detail2", "detail_2", "detail3",
+    "onmodel1", "onmodel2", "look1", "look2", "gm",
+)
+MOOSE_IMG_BASE = "https://www.mooseknucklescanada.com/cdn/shop/files"
+
 @app.route('/scrape-moose-knuckles', methods=['POST'])
-def scrape_moose_knuckles():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_moose_knuckles(sku, max_images):
     """MOOSE KNUCKLES - 17 sufiksa - PARALLEL"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        
-        site_code = sku.lower().replace("-", "_")
-        
-        BASE = "https://www.mooseknucklescanada.com/cdn/shop/files"
-        SUFFIX_ORDER = [
-            "front", "front_category", "front_flat",
-            "back", "side", "left", "right",
-            "detail1", "detail_1", "detail2", "detail_2", "detail3",
-            "onmodel1", "onmodel2", "look1", "look2", "gm"
-        ]
-        
-        # Build all URLs
-        url_list = [(f"{BASE}/{site_code}_{suf}.jpg", {"suffix": suf}) for suf in SUFFIX_ORDER]
-        
-        # Validate in parallel
-        images = validate_urls_parallel(url_list, min_bytes=20000, max_images=max_images)
-        
-        for idx, img in enumerate(images):
-            img["index"] = idx + 1
-            img["filename"] = f"{sku}-{idx + 1}"
-        
-        return jsonify({"sku": sku, "brand_code": site_code, "images": images, "count": len(images)})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    site_code = sku.lower().replace("-", "_")
+    
+    # Build all URLs
+    url_list = [(f"{MOOSE_IMG_BASE}/{site_code}_{suf}.jpg", {"suffix": suf}) for suf in MOOSE_SUFFIX_ORDER]
+    
+    # Validate in parallel
+    hits = validate_urls_parallel(url_list, min_bytes=20000, max_images=max_images)
+    
+    images = image_entries(hits, sku)
+    
+    return jsonify({"sku": sku, "brand_code": site_code, "images": images, "count": len(images)})
 
 
 # ===================== SCOTCH & SODA (PARALLEL) =====================
+SS_SUFFIXES = (
+    "_R_10_FNT_C.png", "_R_10_FNT.png", "_R_10_DTL.png", "_R_10_BCK_C.png",
+    "_FNT.png", "_BCK_C.png", "_BCK.png", "_DTL.png",
+    "_DTL2.png", "-DTL2.png", "_DTL3.png", "-DTL3.png",
+    "_1M.png", "_1M-P.png", "_2M.png", "_3M.png", "_4M.png", "_5M.png", "_6M.png",
+)
+SS_IMG_BASE = "https://scotch-soda.eu/cdn/shop/files"
+
 @app.route('/scrape-scotch-soda', methods=['POST'])
-def scrape_scotch_soda():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_scotch_soda(sku, max_images):
     """SCOTCH & SODA - 18+ sufiksa - PARALLEL"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        
-        if not sku.startswith("SS"):
-            return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
-        
-        rest = sku[2:]
-        if "-" in rest:
-            base, color = rest.rsplit("-", 1)
-            their = f"{base}_{color}"
-        else:
-            their = rest
-        
-        BASE_CDN = "https://scotch-soda.eu/cdn/shop/files"
-        SUFFIXES = [
-            "_R_10_FNT_C.png", "_R_10_FNT.png", "_R_10_DTL.png", "_R_10_BCK_C.png",
-            "_FNT.png", "_BCK_C.png", "_BCK.png", "_DTL.png",
-            "_DTL2.png", "-DTL2.png", "_DTL3.png", "-DTL3.png",
-            "_1M.png", "_1M-P.png", "_2M.png", "_3M.png", "_4M.png", "_5M.png", "_6M.png",
-        ]
-        
-        # Build all URLs
-        url_list = [(f"{BASE_CDN}/Hires_PNG-{their}{suf}?width=1800", {"suffix": suf}) for suf in SUFFIXES]
-        
-        # Validate in parallel
-        images = validate_urls_parallel(url_list, min_bytes=12000, max_images=max_images)
-        
-        for idx, img in enumerate(images):
-            img["index"] = idx + 1
-            img["filename"] = f"{sku}-{idx + 1}"
-        
-        return jsonify({"sku": sku, "brand_code": their, "images": images, "count": len(images)})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    if not sku.startswith("SS"):
+        return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
+    
+    rest = sku[2:]
+    if "-" in rest:
+        base, color = rest.rsplit("-", 1)
+        their = f"{base}_{color}"
+    else:
+        their = rest
+    
+    # Build all URLs
+    url_list = [(f"{SS_IMG_BASE}/Hires_PNG-{their}{suf}?width=1800", {"suffix": suf}) for suf in SS_SUFFIXES]
+    
+    # Validate in parallel
+    hits = validate_urls_parallel(url_list, min_bytes=12000, max_images=max_images)
+    
+    images = image_entries(hits, sku)
+    
+    return jsonify({"sku": sku, "brand_code": their, "images": images, "count": len(images)})
 
 
 # ===================== ETRO =====================
 @app.route('/scrape-etro', methods=['POST'])
-def scrape_etro():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_etro(sku, max_images):
     """ETRO - uses scrapers/etro.py module with multi-size CDN"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        validate = data.get('validate', True)
+    validate = scrape_request().validate_or(True)
 
-        if not sku:
-            return jsonify({"error": "SKU required", "sku": sku, "images": []}), 400
-
-        result = etro_module.scrape(sku, max_images, validate)
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({"error": str(e), "sku": "", "images": []}), 500
+    result = etro_module.scrape(sku, max_images, validate)
+    return jsonify(result)
 
 
 # ===================== GUESS (PARALLEL) =====================
+GUESS_SUFFIXES = ("", "-ALT1", "-ALT2", "-ALT3", "-ALT4", "-ALTGHOST")
+GUESS_IMG_BASE = "https://img.guess.com/image/upload/f_auto,q_auto,fl_strip_profile,e_sharpen:50,w_1920,c_scale/v1/EU/Style/ECOMM/"
+
 @app.route('/scrape-guess', methods=['POST'])
-def scrape_guess():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_guess(sku, max_images):
     """GUESS - 6 sufiksa - PARALLEL"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        
-        parts = sku.split()
-        if len(parts) != 3:
-            return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
-        
-        part1 = parts[0][1:] if parts[0].startswith('G') else parts[0]
-        guess_code = f"{part1}{parts[1]}-{parts[2]}"
-        
-        BASE = "https://img.guess.com/image/upload/f_auto,q_auto,fl_strip_profile,e_sharpen:50,w_1920,c_scale/v1/EU/Style/ECOMM/"
-        SUFFIXES = ["", "-ALT1", "-ALT2", "-ALT3", "-ALT4", "-ALTGHOST"]
-        
-        # Build all URLs
-        url_list = [(f"{BASE}{guess_code}{suffix}", {"suffix": suffix}) for suffix in SUFFIXES]
-        
-        # Validate in parallel
-        images = validate_urls_parallel(url_list, max_images=max_images)
-        
-        for idx, img in enumerate(images):
-            img["index"] = idx + 1
-            img["filename"] = f"{sku.replace(' ', '_')}-{idx + 1}"
-        
-        return jsonify({"sku": sku, "brand_code": guess_code, "images": images, "count": len(images)})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-# ===================== EMPORIO ARMANI =====================
-# Now uses scrapers/emporio_armani.py module with multiple prefix detection (AF, TE, etc.)
+    parts = sku.split()
+    if len(parts) != 3:
+        return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
+    
+    part1 = parts[0][1:] if parts[0].startswith('G') else parts[0]
+    guess_code = f"{part1}{parts[1]}-{parts[2]}"
+    
+    # Build all URLs
+    url_list = [(f"{GUESS_IMG_BASE}{guess_code}{suffix}", {"suffix": suffix}) for suffix in GUESS_SUFFIXES]
+    
+    # Validate in parallel
+    hits = validate_urls_parallel(url_list, max_images=max_images)
+    
+    images = image_entries(hits, sku.replace(' ', '_'))
+    
+    return jsonify({"sku": sku, "brand_code": guess_code, "images": images, "count": len(images)})
 
 
 # ===================== ARMANI EXCHANGE (PARALLEL) =====================
-@app.route('/scrape-armani-exchange', methods=['POST'])
-def scrape_armani_exchange():
-    """ARMANI EXCHANGE - multiple CDN code patterns - PARALLEL"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
+AX_SEASONS = ("FW2025", "SS2025", "FW2024", "SS2024")
+AX_SUFFIXES = ("F", "D", "R", "E", "A")
 
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-
-        base = sku.replace("AR", "")
-        parts = base.split("-")
-        if len(parts) != 3:
-            return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
-
-        part1, part2, part3 = parts
-
-        # Build possible ARTIKAL variants based on first part format
-        artikal_variants = []
-        if part1.isdigit():
-            # Pure numeric (like 942910) - try without prefix first, then with XM/XW
-            artikal_variants = [part1, f"XM{part1}", f"XW{part1}"]
-        elif part1[0].isdigit():
-            # Starts with digit (like 8NZTCK) - try with 8N prefix variants
-            artikal_variants = [part1, f"8N{part1}" if not part1.startswith("8N") else part1]
-        else:
-            # Starts with letter (like UP001 from ARXUP001) - try XU variants
-            artikal_variants = [f"X{part1}", part1, f"XM{part1}", f"XW{part1}"]
-
-        # Build possible STIL variants based on second part format
-        if part2[0].isdigit():
-            # Starts with digit - add AF prefix
-            stil_variants = [f"AF{part2}"]
-        else:
-            # Starts with letter (like XV820, CC783, ZN10Z) - use as-is
-            stil_variants = [part2]
-
-        # Build all CDN code combinations
-        cdn_codes = []
-        for artikal in artikal_variants:
-            for stil in stil_variants:
-                cdn_codes.append(f"{artikal}_{stil}_{part3}")
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def armani_exchange_url_list(sku):
+    """
+    AX SKU -> (cdn_codes, url_list), or (None, None) for an invalid SKU.
+    Cached per SKU - returned tuples/dicts are shared, do not mutate.
+    """
+    base = sku.removeprefix("AR")
+    parts = base.split("-")
+    if len(parts) != 3:
+        return None, None
+
+    part1, part2, part3 = parts
+
+    # Build possible ARTIKAL variants based on first part format
+    artikal_variants = []
+    if part1.isdigit():
+        # Pure numeric (like 942910) - try without prefix first, then with XM/XW
+        artikal_variants = [part1, f"XM{part1}", f"XW{part1}"]
+    elif part1[0].isdigit():
+        # Starts with digit (like 8NZTCK) - try with 8N prefix variants
+        artikal_variants = [part1, f"8N{part1}" if not part1.startswith("8N") else part1]
+    else:
+        # Starts with letter (like UP001 from ARXUP001) - try XU variants
+        artikal_variants = [f"X{part1}", part1, f"XM{part1}", f"XW{part1}"]
+
+    # Build possible STIL variants based on second part format
+    if part2[0].isdigit():
+        # Starts with digit - add AF prefix
+        stil_variants = [f"AF{part2}"]
+    else:
+        # Starts with letter (like XV820, CC783, ZN10Z) - use as-is
+        stil_variants = [part2]
+
+    # Build all CDN code combinations
+    cdn_codes = []
+    for artikal in artikal_variants:
+        for stil in stil_variants:
+            cdn_codes.append(f"{artikal}_{stil}_{part3}")
+
+    # Build all URLs for all code variants
+    # Constant prefix built once per code, inner loop only concatenates
+    url_list = []
+    for cdn_code in cdn_codes:
+        prefix = "https://assets.armani.com/image/upload/f_auto,q_auto:best,ar_4:5,w_1350,c_fill/" + cdn_code + "_"
+        for season in AX_SEASONS:
+            tail = "_" + season + ".jpg"
+            for suf in AX_SUFFIXES:
+                url_list.append((prefix + suf + tail, {"season": season, "suffix": suf, "code": cdn_code}))
+
+    return tuple(cdn_codes), tuple(url_list)
 
-        SEASONS = ['FW2025', 'SS2025', 'FW2024', 'SS2024']
-        SUFFIXES = ["F", "D", "R", "E", "A"]
 
-        # Build all URLs for all code variants
-        url_list = []
-        for cdn_code in cdn_codes:
-            for season in SEASONS:
-                for suf in SUFFIXES:
-                    url = f"https://assets.armani.com/image/upload/f_auto,q_auto:best,ar_4:5,w_1350,c_fill/{cdn_code}_{suf}_{season}.jpg"
-                    url_list.append((url, {"season": season, "suffix": suf, "code": cdn_code}))
+@app.route('/scrape-armani-exchange', methods=['POST'])
+@ttl_cache_sku
+@sku_endpoint
+def scrape_armani_exchange(sku, max_images):
+    """ARMANI EXCHANGE - multiple CDN code patterns - PARALLEL"""
+    cdn_codes, url_list = armani_exchange_url_list(sku)
+    if not cdn_codes:
+        return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
 
-        # Validate in parallel
-        images = validate_urls_parallel(url_list, max_images=max_images, min_bytes=5000)
+    # Validate in parallel
+    hits = validate_urls_parallel(url_list, max_images=max_images, min_bytes=5000)
 
-        # Get the working code from first image
-        working_code = images[0].get("code") if images else cdn_codes[0]
+    # Get the working code from first image
+    working_code = hits[0].metadata.get("code") if hits else cdn_codes[0]
 
-        for idx, img in enumerate(images):
-            img["index"] = idx + 1
-            img["filename"] = f"{sku.replace('-', '_')}-{idx + 1}"
+    images = image_entries(hits, sku.replace('-', '_'))
 
-        return jsonify({"sku": sku, "brand_code": working_code, "images": images, "count": len(images)})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return jsonify({"sku": sku, "brand_code": working_code, "images": images, "count": len(images)})
 
 
 # ===================== MICHAEL KORS (WEBSITE SCRAPING) =====================
 @app.route('/scrape-michael-kors', methods=['POST'])
-def scrape_michael_kors():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_michael_kors(sku, max_images):
     """MICHAEL KORS - website scraping from michaelkors.ae (no proxy needed)"""
-    try:
-        from scrapers import michael_kors
-        data = request.json
-        sku = data.get('sku', '').strip().upper()
-        max_images = data.get('max_images', 5)
-
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-
-        result = michael_kors.scrape(sku, max_images)
-        return jsonify(result)
-    except ImportError:
+    if michael_kors is None:
         return jsonify({"error": "Michael Kors scraper module not found"}), 500
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    sku = sku.upper()
+
+    result = michael_kors.scrape(sku, max_images)
+    return jsonify(result)
 
 
 # ===================== PATRIZIA PEPE (PARALLEL) =====================
+PP_SEASONS = ("2026-1", "2025-2", "2025-1", "2024-2", "2024-1")
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def patrizia_pepe_url_list(sku):
+    """
+    PP SKU -> (full_code, url_list), or (None, None) for an invalid SKU.
+    Cached per SKU - returned tuples/dicts are shared, do not mutate.
+    """
+    parts = sku.split()
+    if len(parts) != 3:
+        return None, None
+    
+    part1 = parts[0][2:] if parts[0].startswith('PP') else parts[0]
+    product_fabric = f"{part1}_{parts[1]}"
+    color = parts[2]
+    full_code = f"{part1}_{parts[1]}_{parts[2]}"
+    
+    # Build all URLs
+    base = f"https://cdn.patriziapepe.com/image/upload/w_1200/q_auto:good/f_auto/CHALCO/SFCC/{product_fabric}/{color}/"
+    tail = f"/{full_code}_"
+    url_list = []
+    for season in PP_SEASONS:
+        prefix = base + season + tail
+        for i in range(1, 9):
+            url_list.append((prefix + str(i) + ".jpg", {"season": season, "position": i}))
+    
+    return full_code, tuple(url_list)
+
+
 @app.route('/scrape-patrizia-pepe', methods=['POST'])
-def scrape_patrizia_pepe():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_patrizia_pepe(sku, max_images):
     """PATRIZIA PEPE - 5 sezona × 8 pozicija - PARALLEL"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        
-        parts = sku.split()
-        if len(parts) != 3:
-            return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
-        
-        part1 = parts[0][2:] if parts[0].startswith('PP') else parts[0]
-        product_fabric = f"{part1}_{parts[1]}"
-        color = parts[2]
-        full_code = f"{part1}_{parts[1]}_{parts[2]}"
-        
-        SEASONS = ["2026-1", "2025-2", "2025-1", "2024-2", "2024-1"]
-        
-        # Build all URLs
-        url_list = []
-        for season in SEASONS:
-            for i in range(1, 9):
-                url = f"https://cdn.patriziapepe.com/image/upload/w_1200/q_auto:good/f_auto/CHALCO/SFCC/{product_fabric}/{color}/{season}/{full_code}_{i}.jpg"
-                url_list.append((url, {"season": season, "position": i}))
-        
-        # Validate in parallel
-        images = validate_urls_parallel(url_list, max_images=max_images)
-        
-        for idx, img in enumerate(images):
-            img["index"] = idx + 1
-            img["filename"] = f"{sku.replace(' ', '_')}-{idx + 1}"
-        
-        return jsonify({"sku": sku, "brand_code": full_code, "images": images, "count": len(images)})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    full_code, url_list = patrizia_pepe_url_list(sku)
+    if not full_code:
+        return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
+    
+    # Validate in parallel
+    hits = validate_urls_parallel(url_list, max_images=max_images)
+    
+    images = image_entries(hits, sku.replace(' ', '_'))
+    
+    return jsonify({"sku": sku, "brand_code": full_code, "images": images, "count": len(images)})
 
 
 # ===================== SANDRO (PARALLEL - Multi-CDN) =====================
+SANDRO_H_SUFFIXES = ("H_1", "H_2", "H_3", "H_4", "H_5")
+SANDRO_F_SUFFIXES = ("F_1", "F_2", "F_3", "F_4", "F_5")
+SANDRO_SHOPIFY = "https://www.sandro.ae/cdn/shop/files/"
+SANDRO_GLOBAL_HI = "https://global.sandro-paris.com/dw/image/v2/BCMW_STG/on/demandware.static/-/Sites-master-catalog/default/images/hi-res/"
+SANDRO_GLOBAL_PK = "https://global.sandro-paris.com/dw/image/v2/BCMW_STG/on/demandware.static/-/Sites-master-catalog/default/images/packshot/"
+SANDRO_EU_HI = "https://eu.sandro-paris.com/dw/image/v2/BCMW_PRD/on/demandware.static/-/Sites-master-catalog/default/images/hi-res/"
+SANDRO_EU_PK = "https://eu.sandro-paris.com/dw/image/v2/BCMW_PRD/on/demandware.static/-/Sites-master-catalog/default/images/packshot/"
+SANDRO_US_HI = "https://us.sandro-paris.com/dw/image/v2/BCMW_PRD/on/demandware.static/-/Sites-master-catalog/default/images/hi-res/"
+SANDRO_UK_HI = "https://uk.sandro-paris.com/dw/image/v2/BCMW_PRD/on/demandware.static/-/Sites-master-catalog/default/images/hi-res/"
+SANDRO_SHOPIFY_Q = "?width=2048"
+SANDRO_DW_Q = "?sw=2000&sh=2000"
+
+# (base, suffix, extension + query, type) in probe order -
+# URL = f"{base}Sandro_{code}_{suffix}{ext}", model shots and packshots alike
+SANDRO_TEMPLATES = (
+    # 1) Shopify CDN - sandro.ae
+    *((SANDRO_SHOPIFY, suf, ext + SANDRO_SHOPIFY_Q, "model") for suf in SANDRO_H_SUFFIXES for ext in (".webp", ".jpg")),
+    (SANDRO_SHOPIFY, "H_P", ".webp" + SANDRO_SHOPIFY_Q, "packshot"),
+    (SANDRO_SHOPIFY, "V_P", ".webp" + SANDRO_SHOPIFY_Q, "packshot"),
+    # 2) Global Demandware - global.sandro-paris.com (H sufiksi, BCMW_STG)
+    *((SANDRO_GLOBAL_HI, suf, ".jpg" + SANDRO_DW_Q, "model") for suf in SANDRO_H_SUFFIXES),
+    (SANDRO_GLOBAL_PK, "H_P", ".jpg" + SANDRO_DW_Q, "packshot"),
+    (SANDRO_GLOBAL_PK, "V_P", ".jpg" + SANDRO_DW_Q, "packshot"),
+    # 3) EU Demandware - eu.sandro-paris.com (F sufiksi, BCMW_PRD)
+    *((SANDRO_EU_HI, suf, ".jpg" + SANDRO_DW_Q, "model") for suf in SANDRO_F_SUFFIXES),
+    (SANDRO_EU_PK, "F_P", ".jpg" + SANDRO_DW_Q, "packshot"),
+    # 4) EU Demandware sa H sufiksima (ponekad rade)
+    *((SANDRO_EU_HI, suf, ".jpg" + SANDRO_DW_Q, "model") for suf in SANDRO_H_SUFFIXES),
+    (SANDRO_EU_PK, "H_P", ".jpg" + SANDRO_DW_Q, "packshot"),
+    (SANDRO_EU_PK, "V_P", ".jpg" + SANDRO_DW_Q, "packshot"),
+    # 5) US Demandware - us.sandro-paris.com
+    *((SANDRO_US_HI, suf, ".jpg" + SANDRO_DW_Q, "model") for suf in SANDRO_H_SUFFIXES + SANDRO_F_SUFFIXES),
+    # 6) UK Demandware - uk.sandro-paris.com
+    *((SANDRO_UK_HI, suf, ".jpg" + SANDRO_DW_Q, "model") for suf in SANDRO_H_SUFFIXES),
+)
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def sandro_url_list(sku):
+    """
+    SANDRO SKU -> (code, url_list) across all CDNs.
+    Cached per SKU - returned tuples/dicts are shared, do not mutate.
+    """
+    code = sku[2:] if sku.startswith('SA') else sku
+    url_list = tuple((f"{base}Sandro_{code}_{suf}{ext}", {"suffix": suf, "type": kind})
+                     for base, suf, ext, kind in SANDRO_TEMPLATES)
+    return code, url_list
+
+
 @app.route('/scrape-sandro', methods=['POST'])
-def scrape_sandro():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_sandro(sku, max_images):
     """SANDRO - Shopify + Global DW + EU DW - H/F/V sufiksi - PARALLEL"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
+    code, url_list = sandro_url_list(sku)
 
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-
-        code = sku[2:] if sku.startswith('SA') else sku
-
-        url_list = []
-        H_SUFFIXES = ["H_1", "H_2", "H_3", "H_4", "H_5"]
-        F_SUFFIXES = ["F_1", "F_2", "F_3", "F_4", "F_5"]
-
-        # 1) Shopify CDN - sandro.ae
-        SHOPIFY = "https://www.sandro.ae/cdn/shop/files/"
-        for suffix in H_SUFFIXES:
-            url_list.append((f"{SHOPIFY}Sandro_{code}_{suffix}.webp?width=2048", {"suffix": suffix, "type": "model"}))
-            url_list.append((f"{SHOPIFY}Sandro_{code}_{suffix}.jpg?width=2048", {"suffix": suffix, "type": "model"}))
-        url_list.append((f"{SHOPIFY}Sandro_{code}_H_P.webp?width=2048", {"suffix": "H_P", "type": "packshot"}))
-        url_list.append((f"{SHOPIFY}Sandro_{code}_V_P.webp?width=2048", {"suffix": "V_P", "type": "packshot"}))
-
-        # 2) Global Demandware - global.sandro-paris.com (H sufiksi, BCMW_STG)
-        GLOBAL_HI = "https://global.sandro-paris.com/dw/image/v2/BCMW_STG/on/demandware.static/-/Sites-master-catalog/default/images/hi-res/"
-        GLOBAL_PK = "https://global.sandro-paris.com/dw/image/v2/BCMW_STG/on/demandware.static/-/Sites-master-catalog/default/images/packshot/"
-        for suffix in H_SUFFIXES:
-            url_list.append((f"{GLOBAL_HI}Sandro_{code}_{suffix}.jpg?sw=2000&sh=2000", {"suffix": suffix, "type": "model"}))
-        url_list.append((f"{GLOBAL_PK}Sandro_{code}_H_P.jpg?sw=2000&sh=2000", {"suffix": "H_P", "type": "packshot"}))
-        url_list.append((f"{GLOBAL_PK}Sandro_{code}_V_P.jpg?sw=2000&sh=2000", {"suffix": "V_P", "type": "packshot"}))
-
-        # 3) EU Demandware - eu.sandro-paris.com (F sufiksi, BCMW_PRD)
-        EU_HI = "https://eu.sandro-paris.com/dw/image/v2/BCMW_PRD/on/demandware.static/-/Sites-master-catalog/default/images/hi-res/"
-        EU_PK = "https://eu.sandro-paris.com/dw/image/v2/BCMW_PRD/on/demandware.static/-/Sites-master-catalog/default/images/packshot/"
-        for suffix in F_SUFFIXES:
-            url_list.append((f"{EU_HI}Sandro_{code}_{suffix}.jpg?sw=2000&sh=2000", {"suffix": suffix, "type": "model"}))
-        url_list.append((f"{EU_PK}Sandro_{code}_F_P.jpg?sw=2000&sh=2000", {"suffix": "F_P", "type": "packshot"}))
-
-        # 4) EU Demandware sa H sufiksima (ponekad rade)
-        for suffix in H_SUFFIXES:
-            url_list.append((f"{EU_HI}Sandro_{code}_{suffix}.jpg?sw=2000&sh=2000", {"suffix": suffix, "type": "model"}))
-        url_list.append((f"{EU_PK}Sandro_{code}_H_P.jpg?sw=2000&sh=2000", {"suffix": "H_P", "type": "packshot"}))
-        url_list.append((f"{EU_PK}Sandro_{code}_V_P.jpg?sw=2000&sh=2000", {"suffix": "V_P", "type": "packshot"}))
-
-        # 5) US Demandware - us.sandro-paris.com
-        US_HI = "https://us.sandro-paris.com/dw/image/v2/BCMW_PRD/on/demandware.static/-/Sites-master-catalog/default/images/hi-res/"
-        for suffix in H_SUFFIXES:
-            url_list.append((f"{US_HI}Sandro_{code}_{suffix}.jpg?sw=2000&sh=2000", {"suffix": suffix, "type": "model"}))
-        for suffix in F_SUFFIXES:
-            url_list.append((f"{US_HI}Sandro_{code}_{suffix}.jpg?sw=2000&sh=2000", {"suffix": suffix, "type": "model"}))
-
-        # 6) UK Demandware - uk.sandro-paris.com
-        UK_HI = "https://uk.sandro-paris.com/dw/image/v2/BCMW_PRD/on/demandware.static/-/Sites-master-catalog/default/images/hi-res/"
-        for suffix in H_SUFFIXES:
-            url_list.append((f"{UK_HI}Sandro_{code}_{suffix}.jpg?sw=2000&sh=2000", {"suffix": suffix, "type": "model"}))
-
-        # Validate in parallel
-        images = validate_urls_parallel(url_list, max_images=max_images)
-
-        for idx, img in enumerate(images):
-            img["index"] = idx + 1
-            img["filename"] = f"{sku.replace('-', '_')}-{idx + 1}"
-
-        return jsonify({"sku": sku, "brand_code": code, "images": images, "count": len(images)})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    # Validate in parallel
+    hits = validate_urls_parallel(url_list, max_images=max_images)
+
+    images = image_entries(hits, sku.replace('-', '_'))
+
+    return jsonify({"sku": sku, "brand_code": code, "images": images, "count": len(images)})
 
 
 # ===================== ANTONY MORATO (MODULE) =====================
 @app.route('/scrape-morato', methods=['POST'])
-def scrape_morato():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_morato(sku, max_images):
     """ANTONY MORATO - uses module with prefix probing (FA, LE, YA)"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
+    result = antony_morato.scrape(sku, max_images=max_images)
 
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
+    if result.get("error") and result.get("count", 0) == 0:
+        return jsonify(result), 404
 
-        result = antony_morato.scrape(sku, max_images=max_images)
+    return jsonify(result)
 
-        if result.get("error") and result.get("count", 0) == 0:
-            return jsonify(result), 404
 
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+# ===================== REPLAY (PARALLEL with watermark filter) =====================
+# Mid variants - 000 is most common, then others
+REPLAY_MID_VARIANTS = ("000", "001", "002", "006", "007", "009", "010", "050", "051", "055", "064")
+# Priority regions that work best (from user's local script)
+REPLAY_LOCALES = ("gr", "it", "de", "fr", "es", "eu", "uk", "us")
+REPLAY_CDN_BASE = "https://replayjeans.kleecks-cdn.com"
+# Placeholder "no image" watermark is one byte-identical file, so its
+# size alone identifies it (md5 b7b532cb2ea2ae3c91decf2bc87b1c01)
+REPLAY_WATERMARK_SIZE = 26238
+REPLAY_MIN_BYTES = 8000  # Lowered to match working local script
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def replay_url_list(sku):
+    """
+    REPLAY SKU -> (cdn_codes, url_list), or (None, None) for an invalid SKU.
+    Cached per SKU - returned tuples/dicts are shared, do not mutate.
+    """
+    s = sku.strip()
+    if s.startswith('R'):
+        s = s[1:]
+
+    # Format: M3015 {2660}323 or AW2608 {A0500C}0103
+    match = REPLAY_SKU_RE.fullmatch(s)
+    if not match:
+        return None, None
+
+    model = match.group(1)
+    fabric = match.group(2).replace(' ', '-')  # Replace spaces with dash
+    color = match.group(3).strip()
+    cdn_codes = [f"{model}_{mid}_{fabric}_{color}" for mid in REPLAY_MID_VARIANTS]
+
+    # Build URLs - prioritize 000 mid variant first, then others
+    url_list = []
+    for cdn_code in cdn_codes:
+        d1, d2 = cdn_code[0], cdn_code[1]
+        for loc in REPLAY_LOCALES:
+            root = f"{REPLAY_CDN_BASE}/{loc}/media/catalog/product/{d1}/{d2}"
+            # Primary positions 1-10
+            for i in range(1, 11):
+                url = f"{root}/{cdn_code}_{i}.jpg"
+                url_list.append((url, {"locale": loc, "position": i, "code": cdn_code}))
+
+    return tuple(cdn_codes), tuple(url_list)
 
 
-# ===================== REPLAY (PARALLEL with watermark filter) =====================
 @app.route('/scrape-replay', methods=['POST'])
-def scrape_replay():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_replay(sku, max_images):
     """REPLAY - multi-region, filtrira watermark - PARALLEL"""
-    try:
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-
-        WATERMARK_HASHES = {"b7b532cb2ea2ae3c91decf2bc87b1c01"}
-        WATERMARK_SIZE = 26238
-        MIN_REPLAY_BYTES = 8000  # Lowered to match working local script
-
-        def parse_replay_sku(s):
-            s = s.strip()
-            if s.startswith('R'):
-                s = s[1:]
-
-            # Format: M3015 {2660}323 or AW2608 {A0500C}0103
-            match = re.match(r'^([A-Z0-9]+)\s*\{([^}]+)\}(.+)$', s)
-            if match:
-                model = match.group(1)
-                fabric = match.group(2).replace(' ', '-')  # Replace spaces with dash
-                color = match.group(3).strip()
-                # Mid variants - 000 is most common, then others
-                MID_VARIANTS = ["000", "001", "002", "006", "007", "009", "010", "050", "051", "055", "064"]
-                codes = [f"{model}_{mid}_{fabric}_{color}" for mid in MID_VARIANTS]
-                return codes, model
-
-            return None, None
-
-        cdn_codes, model = parse_replay_sku(sku)
-        if not cdn_codes:
-            return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
-
-        CDN_BASE = "https://replayjeans.kleecks-cdn.com"
-        # Priority regions that work best (from user's local script)
-        LOCALES = ["gr", "it", "de", "fr", "es", "eu", "uk", "us"]
-
-        # Build URLs - prioritize 000 mid variant first, then others
-        url_list = []
-        for cdn_code in cdn_codes:
-            d1, d2 = cdn_code[0], cdn_code[1]
-            for loc in LOCALES:
-                root = f"{CDN_BASE}/{loc}/media/catalog/product/{d1}/{d2}"
-                # Primary positions 1-10
-                for i in range(1, 11):
-                    url = f"{root}/{cdn_code}_{i}.jpg"
-                    url_list.append((url, {"locale": loc, "position": i, "code": cdn_code}))
-
-        # Custom parallel validation with watermark filter
-        def validate_replay_url(args):
-            url, metadata = args
-            try:
-                r = session.get(url, timeout=10)
-                if r.status_code == 200 and len(r.content) >= MIN_REPLAY_BYTES:
-                    ctype = r.headers.get("Content-Type", "").lower()
-                    if "image" in ctype:
-                        if len(r.content) == WATERMARK_SIZE:
-                            return (url, False, None, None, metadata)
-                        img_hash = hashlib.md5(r.content).hexdigest()
-                        if img_hash in WATERMARK_HASHES:
-                            return (url, False, None, None, metadata)
-                        return (url, True, r.content, img_hash, metadata)
-            except:
-                pass
-            return (url, False, None, None, metadata)
-
-        # Validate in parallel
-        url_order = {url: idx for idx, (url, _) in enumerate(url_list)}
-        results = []
-
-        with ThreadPoolExecutor(max_workers=MAX_VALIDATION_WORKERS) as executor:
-            futures = [executor.submit(validate_replay_url, args) for args in url_list]
-            for future in as_completed(futures):
-                try:
-                    result = future.result()
-                    if result[1]:
-                        results.append(result)
-                except:
-                    pass
-
-        # Sort by original order to maintain position priority
-        results.sort(key=lambda x: url_order.get(x[0], 999))
-
-        images = []
-        seen_hashes = set()
-        working_code = None
-
-        for url, is_valid, content, img_hash, metadata in results:
-            if len(images) >= max_images:
-                break
-            if img_hash and img_hash not in seen_hashes:
-                seen_hashes.add(img_hash)
-                if not working_code:
-                    working_code = metadata["code"]
-                images.append({"url": url, "locale": metadata["locale"], "position": metadata["position"]})
-
-        for idx, img in enumerate(images):
-            img["index"] = idx + 1
-            img["filename"] = f"{re.sub(r'[{}]', '', sku).replace(' ', '_')}-{idx + 1}"
-
-        return jsonify({"sku": sku, "brand_code": working_code or cdn_codes[0], "images": images, "count": len(images)})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    cdn_codes, url_list = replay_url_list(sku)
+    if not cdn_codes:
+        return jsonify({"error": f"Invalid SKU format: {sku}"}), 400
+
+    # Custom parallel validation with watermark filter
+    @cache_url_results
+    def validate_replay_url(args):
+        url, metadata = args
+        # Ranged GET - Content-Range carries the full size, so the
+        # watermark and tiny files are spotted without their bodies
+        r = session.get(url, timeout=10, headers=HASH_RANGE)
+        if r.status_code not in (200, 206):
+            raise_unless_miss(r.status_code)  # 403 / 5xx: not cached, retried next time
+            return Hit(url, False, metadata=metadata)
+        ctype = r.headers.get("Content-Type", "").lower()
+        if "image" not in ctype:
+            return Hit(url, False, metadata=metadata)
+        size = body_size(r)
+        if size >= REPLAY_MIN_BYTES and size != REPLAY_WATERMARK_SIZE:
+            return Hit(url, True, hash=prefix_hash(r.content, size), metadata=metadata)
+        return Hit(url, False, metadata=metadata)
+
+    # Validate in parallel, in position priority order
+    hits = validate_in_order(validate_replay_url, url_list, max_images)
+    working_code = hits[0].metadata["code"] if hits else None
+
+    clean_sku = REPLAY_BRACES_RE.sub('', sku).replace(' ', '_')
+    images = [{"url": hit.url, "locale": hit.metadata["locale"], "position": hit.metadata["position"],
+               "index": n, "filename": f"{clean_sku}-{n}"}
+              for n, hit in enumerate(hits, 1)]
+
+    return jsonify({"sku": sku, "brand_code": working_code or cdn_codes[0], "images": images, "count": len(images)})
 
 
 # ===================== SUPERDRY =====================
 @app.route('/scrape-superdry', methods=['POST'])
-def scrape_superdry():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_superdry(sku, max_images):
     """SUPERDRY - website scraping (random CDN IDs)"""
-    try:
-        from scrapers import superdry
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-
-        result = superdry.scrape(sku, max_images)
-        return jsonify(result)
-    except ImportError:
+    if superdry is None:
         return jsonify({"error": "Superdry scraper module not found"}), 500
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+
+    result = superdry.scrape(sku, max_images)
+    return jsonify(result)
 
 
 # ===================== JOOP =====================
 @app.route('/scrape-joop', methods=['POST'])
-def scrape_joop():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_joop(sku, max_images):
     """JOOP - zahteva website scraping"""
-    try:
-        from scrapers import joop
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        
-        result = joop.scrape(sku, max_images)
-        return jsonify(result)
-    except ImportError:
+    if joop is None:
         return jsonify({"error": "JOOP scraper module not found. Add scrapers/joop.py"}), 500
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    
+    result = joop.scrape(sku, max_images)
+    return jsonify(result)
 
 
 # ===================== STRELLSON =====================
 @app.route('/scrape-strellson', methods=['POST'])
-def scrape_strellson():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_strellson(sku, max_images):
     """STRELLSON - zahteva website scraping"""
-    try:
-        from scrapers import strellson
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        
-        result = strellson.scrape(sku, max_images)
-        return jsonify(result)
-    except ImportError:
+    if strellson is None:
         return jsonify({"error": "Strellson scraper module not found. Add scrapers/strellson.py"}), 500
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    
+    result = strellson.scrape(sku, max_images)
+    return jsonify(result)
 
 
 # ===================== WOOLRICH =====================
 @app.route('/scrape-woolrich', methods=['POST'])
-def scrape_woolrich():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_woolrich(sku, max_images):
     """WOOLRICH - zahteva website scraping"""
-    try:
-        from scrapers import woolrich
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        
-        result = woolrich.scrape(sku, max_images)
-        return jsonify(result)
-    except ImportError:
+    if woolrich is None:
         return jsonify({"error": "Woolrich scraper module not found. Add scrapers/woolrich.py"}), 500
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    
+    result = woolrich.scrape(sku, max_images)
+    return jsonify(result)
 
 
 # ===================== FALKE =====================
 @app.route('/scrape-falke', methods=['POST'])
-def scrape_falke():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_falke(sku, max_images):
     """FALKE - zahteva website scraping"""
-    try:
-        from scrapers import falke
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        
-        result = falke.scrape(sku, max_images)
-        return jsonify(result)
-    except ImportError:
+    if falke is None:
         return jsonify({"error": "Falke scraper module not found. Add scrapers/falke.py"}), 500
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    
+    result = falke.scrape(sku, max_images)
+    return jsonify(result)
 
 
 # ===================== ENTERPRISE JAPAN =====================
 @app.route('/scrape-enterprise-japan', methods=['POST'])
-def scrape_enterprise_japan():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_enterprise_japan(sku, max_images):
     """ENTERPRISE JAPAN - CDN + PDP scraping"""
-    try:
-        from scrapers import enterprise_japan
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        
-        result = enterprise_japan.scrape(sku, max_images)
-        return jsonify(result)
-    except ImportError:
+    if enterprise_japan is None:
         return jsonify({"error": "Enterprise Japan scraper module not found. Add scrapers/enterprise_japan.py"}), 500
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    
+    result = enterprise_japan.scrape(sku, max_images)
+    return jsonify(result)
 
 
 # ===================== LEVI'S =====================
 @app.route('/scrape-levis', methods=['POST'])
-def scrape_levis_endpoint():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_levis_endpoint(sku, max_images):
     """LEVI'S - uses scrapers/scrape_levis.py module"""
-    try:
-        from scrapers.scrape_levis import scrape_levis
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        result = scrape_levis(sku, max_images)
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    if levis is None:
+        return jsonify({"error": "Levi's scraper module not found"}), 500
+
+    result = levis.scrape_levis(sku, max_images)
+    return jsonify(result)
 
 
 # ===================== GOLDEN GOOSE =====================
 @app.route('/scrape-golden-goose', methods=['POST'])
-def scrape_golden_goose_endpoint():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_golden_goose_endpoint(sku, max_images):
     """GOLDEN GOOSE - uses scrapers/scrape_golden_goose.py module"""
-    try:
-        from scrapers.scrape_golden_goose import scrape_golden_goose
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        if not sku:
-            return jsonify({"error": "SKU required"}), 400
-        result = scrape_golden_goose(sku, max_images)
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    if golden_goose is None:
+        return jsonify({"error": "Golden Goose scraper module not found"}), 500
+
+    result = golden_goose.scrape_golden_goose(sku, max_images)
+    return jsonify(result)
 
 
 # ===================== LIU JO =====================
 @app.route('/scrape-liujo', methods=['POST'])
-def scrape_liujo_endpoint():
+@ttl_cache_sku
+@sku_endpoint
+def scrape_liujo_endpoint(sku, max_images):
     """LIU JO - uses scrapers/liujo.py module"""
-    try:
-        from scrapers import liujo
-        data = request.json
-        sku = data.get('sku', '').strip()
-        max_images = data.get('max_images', 5)
-        validate = data.get('validate', False)
-        if not sku:
-            return jsonify({"error": "SKU required", "sku": sku, "images": []}), 400
-        result = liujo.scrape(sku, max_images, validate)
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({"error": str(e), "sku": "", "images": []}), 500
+    validate = scrape_request().validate_or(False)
+    result = liujo.scrape(sku, max_images, validate)
+    return jsonify(result)
 
 
 # ===================== GENERIC ENDPOINT =====================
-@app.route('/scrape', methods=['POST'])
-def scrape_generic():
-    brand = request.json.get('brand', '').upper().strip()
-    routes = {
-        # EXISTING
-        'BOSS': scrape_boss, 'HUGO BOSS': scrape_boss, 'HUGO': scrape_boss,
-        'MAJE': scrape_maje,
-        'MANGO': scrape_mango,
-        'TOMMY': scrape_tommy, 'TOMMY HILFIGER': scrape_tommy,
-        'ALLSAINTS': scrape_allsaints, 'ALL SAINTS': scrape_allsaints,
-        'BOGGI': scrape_boggi, 'BOGGI MILANO': scrape_boggi,
-        'DSQUARED2': scrape_dsquared2_endpoint, 'DSQ': scrape_dsquared2_endpoint,
-        
-        # NEW CDN BRANDS
-        'CALVIN KLEIN': scrape_calvin_klein, 'CK': scrape_calvin_klein,
-        'DIESEL': scrape_diesel,
-        'KURT GEIGER': scrape_kurt_geiger, 'KG': scrape_kurt_geiger,
-        'KATE SPADE': scrape_kate_spade, 'KS': scrape_kate_spade,
-        'PAUL TAYLOR': scrape_paul_taylor, 'PT': scrape_paul_taylor,
-        'MOOSE KNUCKLES': scrape_moose_knuckles, 'MOOSE': scrape_moose_knuckles,
-        'SCOTCH SODA': scrape_scotch_soda, 'SCOTCH & SODA': scrape_scotch_soda,
-        'ETRO': scrape_etro,
-        'GUESS': scrape_guess,
-        'EMPORIO ARMANI': scrape_emporio_armani_endpoint, 'EA': scrape_emporio_armani_endpoint,
-        'ARMANI EXCHANGE': scrape_armani_exchange, 'AX': scrape_armani_exchange,
-        'MICHAEL KORS': scrape_michael_kors, 'MK': scrape_michael_kors,
-        'PATRIZIA PEPE': scrape_patrizia_pepe, 'PP': scrape_patrizia_pepe,
-        'SANDRO': scrape_sandro,
-        'ANTONY MORATO': scrape_morato, 'MORATO': scrape_morato,
-        'REPLAY': scrape_replay,
-        
-        # SCRAPER BRANDS (require scrapers/ modules)
-        'SUPERDRY': scrape_superdry, 'SD': scrape_superdry,
-        'JOOP': scrape_joop,
-        'STRELLSON': scrape_strellson,
-        'WOOLRICH': scrape_woolrich,
-        'FALKE': scrape_falke,
-        'ENTERPRISE JAPAN': scrape_enterprise_japan, 'EJ': scrape_enterprise_japan,
-        "LEVI'S": scrape_levis_endpoint, 'LEVIS': scrape_levis_endpoint,
-        'GOLDEN GOOSE': scrape_golden_goose_endpoint, 'GG': scrape_golden_goose_endpoint,
-        'COACH': scrape_coach_endpoint,
-        'LIU JO': scrape_liujo_endpoint, 'LIUJO': scrape_liujo_endpoint, 'LJ': scrape_liujo_endpoint,
-    }
+# Built once at import - read-only brand -> handler table
+BRAND_ROUTES = MappingProxyType({
+    # EXISTING
+    'BOSS': scrape_boss, 'HUGO BOSS': scrape_boss, 'HUGO': scrape_boss,
+    'MAJE': scrape_maje,
+    'MANGO': scrape_mango,
+    'TOMMY': scrape_tommy, 'TOMMY HILFIGER': scrape_tommy,
+    'ALLSAINTS': scrape_allsaints, 'ALL SAINTS': scrape_allsaints,
+    'BOGGI': scrape_boggi, 'BOGGI MILANO': scrape_boggi,
+    'DSQUARED2': scrape_dsquared2_endpoint, 'DSQ': scrape_dsquared2_endpoint,
     
-    if brand in routes:
-        return routes[brand]()
+    # NEW CDN BRANDS
+    'CALVIN KLEIN': scrape_calvin_klein, 'CK': scrape_calvin_klein,
+    'DIESEL': scrape_diesel,
+    'KURT GEIGER': scrape_kurt_geiger, 'KG': scrape_kurt_geiger,
+    'KATE SPADE': scrape_kate_spade, 'KS': scrape_kate_spade,
+    'PAUL TAYLOR': scrape_paul_taylor, 'PT': scrape_paul_taylor,
+    'MOOSE KNUCKLES': scrape_moose_knuckles, 'MOOSE': scrape_moose_knuckles,
+    'SCOTCH SODA': scrape_scotch_soda, 'SCOTCH & SODA': scrape_scotch_soda,
+    'ETRO': scrape_etro,
+    'GUESS': scrape_guess,
+    'EMPORIO ARMANI': scrape_emporio_armani_endpoint, 'EA': scrape_emporio_armani_endpoint,
+    'ARMANI EXCHANGE': scrape_armani_exchange, 'AX': scrape_armani_exchange,
+    'MICHAEL KORS': scrape_michael_kors, 'MK': scrape_michael_kors,
+    'PATRIZIA PEPE': scrape_patrizia_pepe, 'PP': scrape_patrizia_pepe,
+    'SANDRO': scrape_sandro,
+    'ANTONY MORATO': scrape_morato, 'MORATO': scrape_morato,
+    'REPLAY': scrape_replay,
     
-    return jsonify({
-        "error": f"Unknown brand: {brand}",
-        "available_brands": sorted(list(set(routes.keys())))
-    }), 400
+    # SCRAPER BRANDS (require scrapers/ modules)
+    'SUPERDRY': scrape_superdry, 'SD': scrape_superdry,
+    'JOOP': scrape_joop,
+    'STRELLSON': scrape_strellson,
+    'WOOLRICH': scrape_woolrich,
+    'FALKE': scrape_falke,
+    'ENTERPRISE JAPAN': scrape_enterprise_japan, 'EJ': scrape_enterprise_japan,
+    "LEVI'S": scrape_levis_endpoint, 'LEVIS': scrape_levis_endpoint,
+    'GOLDEN GOOSE': scrape_golden_goose_endpoint, 'GG': scrape_golden_goose_endpoint,
+    'COACH': scrape_coach_endpoint,
+    'LIU JO': scrape_liujo_endpoint, 'LIUJO': scrape_liujo_endpoint, 'LJ': scrape_liujo_endpoint,
+})
+AVAILABLE_BRANDS = tuple(sorted(set(BRAND_ROUTES)))
+# The ~150-name list is the bulk of every unknown-brand answer - encode it once
+AVAILABLE_BRANDS_JSON = json_bytes(AVAILABLE_BRANDS)
+
+
+def unknown_brand(brand):
+    """400 for a brand missing from BRAND_ROUTES (same bytes jsonify() would give)"""
+    body = b'{"available_brands":%s,"error":%s}' % (AVAILABLE_BRANDS_JSON, json_bytes(f"Unknown brand: {brand}"))
+    return json_response(body, 400)
+
+
+@app.route('/scrape', methods=['POST'])
+def scrape_generic():
+    data = request_body()
+    brand = str(data.get('brand') or '').strip().upper()
+    handler = BRAND_ROUTES.get(brand)
+    if handler is not None:
+        scrape_request(data)  # the brand handler reuses this body, no second lookup
+        return handler()
+    return unknown_brand(brand)
+
+
+# ===================== BATCH ENDPOINT =====================
+BATCH_MAX_SKUS = 200  # ~ what one n8n run sends, keeps a call under the gunicorn timeout
+# SKUs scraped at once - each keeps up to MAX_VALIDATION_WORKERS probes in
+# flight, so this many fill every validation lane of the shared pool
+BATCH_WORKERS = POOL_SIZE // MAX_VALIDATION_WORKERS
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix="batch")
+SKUS_REQUIRED_BODY = json_bytes({"error": "skus must be a non-empty list"})
+
+
+@app.route('/scrape-batch', methods=['POST'])
+def scrape_batch():
+    """
+    Many SKUs of one brand in one call:
+    {"brand": "PP", "skus": [...], "max_images": 5} -> {"results": {sku: result}}
+    SKUs run in parallel on the shared sessions, pools and caches.
+    """
+    data = request_body()
+    brand = str(data.get('brand') or '').strip().upper()
+    handler = BRAND_ROUTES.get(brand)
+    if handler is None:
+        return unknown_brand(brand)
+
+    skus = data.get('skus')
+    if not isinstance(skus, list) or not skus:
+        return json_response(SKUS_REQUIRED_BODY, 400)
+    if len(skus) > BATCH_MAX_SKUS:
+        return jsonify({"error": f"Too many SKUs: {len(skus)} (max {BATCH_MAX_SKUS})"}), 400
+    skus = list(dict.fromkeys(str(sku).strip() for sku in skus))
+
+    body = {"max_images": data.get('max_images', 5)}
+    if 'validate' in data:
+        body['validate'] = data['validate']
+
+    def scrape_one(sku):
+        # Same path as a single-SKU call (response cache), minus HTTP and
+        # minus a JSON round trip per SKU - the body is handed over parsed
+        with app.test_request_context(method="POST"):
+            scrape_request({**body, "sku": sku})
+            response = handler()
+        if isinstance(response, tuple):
+            response = response[0]
+        return response.get_data().strip()
+
+    results = dict(zip(skus, batch_executor.map(scrape_one, skus)))
+    # Splice the already-serialized per-SKU bodies (often straight from
+    # scrape_cache) instead of decoding and re-encoding every result.
+    # Same bytes jsonify() would give: compact, keys sorted
+    entries = b",".join(json_bytes(sku) + b":" + results[sku] for sku in sorted(results))
+    body = b'{"brand":%s,"count":%d,"results":{%s}}' % (json_bytes(brand), len(results), entries)
+    return json_response(body)
 
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # Local runs only - production is gunicorn (Procfile + gunicorn.conf.py).
+    # Reloader + debugger only when asked for, never by default
+    app.run(host='0.0.0.0', port=5000, threaded=True, debug=os.environ.get("FLASK_DEBUG") == "1")
@@ -13,13 +13,14 @@ Uses parallel workers for faster image discovery.
 
 import requests
 from requests.adapters import HTTPAdapter, Retry
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 # ===================== CONFIGURATION =====================
 CDN_BASE = "https://cdn.antonymorato.com.filoblu.com/rx/960x,ofmt_webp/media/catalog/product"
 TIMEOUT = 8
 MIN_SIZE = 1000
-MAX_WORKERS = 10
+MAX_WORKERS = 10  # = pool_maxsize, only the shared executor's threads use the session
 
 # Prefix mapping - for ambiguous codes, lists all possibilities to try
 PREFIX_MAP = {
@@ -40,14 +41,18 @@ PREFIX_MAP = {
 # ===================== HTTP SESSION =====================
 session = requests.Session()
 retries = Retry(total=2, backoff_factor=0.3)
-adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retries)
+adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS, max_retries=retries)  # one CDN host
 session.mount("https://", adapter)
 session.headers.update({
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/124"
 })
 
+# Shared across requests - discovery probes every candidate at once
+executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="morato")
+
 
 # ===================== SKU CONVERSION =====================
+@lru_cache(maxsize=4096)
 def convert_sku_candidates(our_sku):
     """
     Convert our SKU to list of possible Morato codes.
@@ -55,14 +60,14 @@ def convert_sku_candidates(our_sku):
     AMFL011181501789000 -> ["MMFL01118-FA150178-9000"]
     AMKS026011002581016 -> ["MMKS02601-FA100258-1016", "MMKS02601-LE100258-1016", "MMKS02601-YA100258-1016"]
 
-    Returns list of candidates to try (for ambiguous prefixes).
+    Returns tuple of candidates to try (for ambiguous prefixes), cached per SKU.
     """
     sku = our_sku.strip().upper()
     if sku.startswith('AM'):
         sku = sku[2:]
 
     if len(sku) < 15:
-        return []
+        return ()
 
     model = sku[:7]           # FL01118
     rest = sku[7:]            # 1501789000
@@ -78,7 +83,7 @@ def convert_sku_candidates(our_sku):
         morato = f"MM{model}-{prefix}{fabric_start}{fabric_num}-{color}"
         candidates.append(morato)
 
-    return candidates
+    return tuple(candidates)
 
 
 def check_url(url):
@@ -93,64 +98,63 @@ def check_url(url):
     return False
 
 
-def check_cdn_url(morato_code):
-    """Check if CDN URL exists, return first working URL or None."""
+def cdn_urls(morato_code, sfx):
+    """The 3 spellings the CDN uses for one image file, in probe order."""
     fn = morato_code.upper()
     d1, d2 = fn[0], fn[1]
+    return (
+        f"{CDN_BASE}/{d1}/{d2}/{fn}{sfx}",
+        f"{CDN_BASE}/{d1.lower()}/{d2.lower()}/{fn.lower()}{sfx}",
+        f"{CDN_BASE}/{d1}/{d2}/{fn}-UN{sfx}",
+    )
 
-    # Try position 01 first
-    urls = [
-        f"{CDN_BASE}/{d1}/{d2}/{fn}_01.jpg",
-        f"{CDN_BASE}/{d1.lower()}/{d2.lower()}/{fn.lower()}_01.jpg",
-        f"{CDN_BASE}/{d1}/{d2}/{fn}-UN_01.jpg",
-    ]
 
-    for url in urls:
-        if check_url(url):
-            return url
+def find_working_code(candidates):
+    """
+    First candidate code with a position 01 image -> (code, url), else (None, None).
+    All candidates x spellings are probed at once; the answer still follows
+    candidate order, and probes not started yet are dropped once it is known.
+    """
+    probes = [(code, url) for code in candidates for url in cdn_urls(code, "_01.jpg")]
+    futures = [executor.submit(check_url, url) for _, url in probes]
+    try:
+        for (code, url), future in zip(probes, futures):
+            if future.result():
+                return code, url
+    finally:
+        for future in futures:
+            future.cancel()
+    return None, None
+
 
-    return None
+def check_cdn_url(morato_code):
+    """Check if CDN URL exists, return first working URL or None."""
+    return find_working_code((morato_code,))[1]
 
 
-def get_all_images_parallel(morato_code, max_images=5):
-    """Get all image URLs using parallel workers."""
-    fn = morato_code.upper()
-    d1, d2 = fn[0], fn[1]
+def get_all_images_parallel(morato_code, max_images=5, first_url=None):
+    """
+    Get all image URLs using parallel workers (shared executor).
+    first_url: position 01 as found by discovery - not probed again.
+    Per position the first working spelling wins, positions in order.
+    """
+    found_urls = [first_url] if first_url else []
+    start = 2 if first_url else 1
+    probes = [(i, url) for i in range(start, 11) for url in cdn_urls(morato_code, f"_{i:02d}.jpg")]
+    futures = [executor.submit(check_url, url) for _, url in probes]
+    try:
+        last_idx = 0
+        for (idx, url), future in zip(probes, futures):
+            if len(found_urls) >= max_images:
+                break
+            if idx != last_idx and future.result():
+                found_urls.append(url)
+                last_idx = idx
+    finally:
+        for future in futures:
+            future.cancel()
 
-    # Build all candidate URLs (positions 01-10)
-    candidates = []
-    for i in range(1, 11):
-        sfx = f"_{i:02d}.jpg"
-        candidates.append((i, f"{CDN_BASE}/{d1}/{d2}/{fn}{sfx}"))
-        candidates.append((i, f"{CDN_BASE}/{d1.lower()}/{d2.lower()}/{fn.lower()}{sfx}"))
-        candidates.append((i, f"{CDN_BASE}/{d1}/{d2}/{fn}-UN{sfx}"))
-
-    # Check all in parallel
-    found_urls = {}
-
-    def check_candidate(item):
-        idx, url = item
-        if check_url(url):
-            return (idx, url)
-        return None
-
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        futures = {executor.submit(check_candidate, c): c for c in candidates}
-        for future in as_completed(futures):
-            result = future.result()
-            if result:
-                idx, url = result
-                if idx not in found_urls:
-                    found_urls[idx] = url
-
-    # Sort by index and return up to max_images
-    images = []
-    for idx in sorted(found_urls.keys()):
-        if len(images) >= max_images:
-            break
-        images.append(found_urls[idx])
-
-    return images
+    return found_urls[:max_images]
 
 
 # ===================== MAIN SCRAPE FUNCTION =====================
@@ -182,23 +186,18 @@ def scrape(sku: str, max_images: int = 5, validate: bool = False) -> dict:
         result["error"] = f"Invalid SKU format: {sku}"
         return result
 
-    # Try each candidate until one works
-    working_code = None
-    for code in candidates:
-        url = check_cdn_url(code)
-        if url:
-            working_code = code
-            break
+    # Probe all candidates in parallel, first one (in prefix order) that works wins
+    working_code, first_url = find_working_code(candidates)
 
     if not working_code:
         result["error"] = f"No images found on CDN. Tried: {', '.join(candidates)}"
-        result["tried_codes"] = candidates
+        result["tried_codes"] = list(candidates)
         return result
 
     result["morato_code"] = working_code
 
     # Get all images in parallel
-    image_urls = get_all_images_parallel(working_code, max_images)
+    image_urls = get_all_images_parallel(working_code, max_images, first_url)
 
     if not image_urls:
         result["error"] = f"No images found for {working_code}"
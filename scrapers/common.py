@@ -0,0 +1,63 @@
+"""
+Shared scraper helpers
+Values and probes used by more than one scraper module (and scrape_api)
+"""
+
+import os
+from collections import deque
+from itertools import islice
+
+REQUEST_THREADS = int(os.environ.get("GUNICORN_THREADS", 4))  # Concurrent requests per gunicorn worker (threads in gunicorn.conf.py)
+HASH_PREFIX_BYTES = 64 * 1024  # Dedup looks at the first 64 KiB + total size
+HASH_RANGE = {"Range": f"bytes=0-{HASH_PREFIX_BYTES - 1}"}
+
+
+def body_size(r):
+    """Full body size of a response, including a 206 slice of a bigger body"""
+    if r.status_code == 206:
+        total = r.headers.get("Content-Range", "").rpartition("/")[2]
+        if total.isdigit():
+            return int(total)
+    return len(r.content)
+
+
+def validate_image(session, url, timeout, min_size):
+    """
+    Proveri da li slika postoji. HEAD sa Content-Length je dovoljan -
+    telo (content) se skida samo kada server ne javi velicinu
+    """
+    try:
+        r = session.head(url, timeout=timeout, allow_redirects=True)
+        length = r.headers.get("Content-Length", "")
+        if r.status_code == 200 and length.isdigit():
+            return int(length) > min_size, None
+        r = session.get(url, timeout=timeout)
+        if r.status_code == 200 and len(r.content) > min_size:
+            return True, r.content
+        return False, None
+    except:
+        return False, None
+
+
+def first_valid_images(executor, validate, image_urls, max_images, window):
+    """
+    Prvih max_images validnih slika, redosledom sa stranice. validate(url)
+    vraca (ok, content); najvise window provera u letu na executor-u -
+    kad ih ima dovoljno, ostale se ne salju
+    """
+    valid = []
+    pending = deque()
+    urls = iter(image_urls)
+    try:
+        while len(valid) < max_images:
+            for url in islice(urls, window - len(pending)):
+                pending.append((url, executor.submit(validate, url)))
+            if not pending:
+                break
+            url, future = pending.popleft()
+            if future.result()[0]:
+                valid.append(url)
+    finally:
+        for _, future in pending:
+            future.cancel()
+    return valid
@@ -20,7 +20,9 @@ VIEWS = ["C", "E", "F", "I", "B", "D", "A", "G", "H"]
 
 MIN_SIZE = 20000  # Minimum valid image size
 TIMEOUT = 8
-MAX_WORKERS = 9
+MAX_WORKERS = 9  # = pool_maxsize, one keep-alive socket per view check
+HEAD_UNSUPPORTED = (403, 405, 501)  # CDN refuses HEAD - fall back to GET
+WHITESPACE_RE = re.compile(r"\s+")
 
 # Prefix mapping (for DSA, DSX, DSY format)
 PREFIX_MAP = {
@@ -34,13 +36,19 @@ def get_session():
     s = requests.Session()
     r = Retry(total=2, connect=2, read=2, backoff_factor=0.2,
               status_forcelist=(429, 500, 502, 503, 504))
-    s.mount("https://", HTTPAdapter(max_retries=r, pool_connections=16, pool_maxsize=16))
+    s.mount("https://", HTTPAdapter(max_retries=r, pool_connections=1, pool_maxsize=MAX_WORKERS))
     s.headers.update({
         "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 Chrome/124 Safari/537.36"
     })
     return s
 
 
+# Shared across requests - kept-alive CDN sockets and warm threads, not one
+# new session + pool per SKU. Only the executor's threads use the session
+session = get_session()
+executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="diesel")
+
+
 def format_sku(sku):
     """
     Convert SKU to Diesel CDN parts.
@@ -48,7 +56,7 @@ def format_sku(sku):
     DS00C06P 09N49 02 → ("00C06P", "09N49", "02")
     DS1DR166 PR389 T8013 → ("1DR166", "PR389", "T8013")
     """
-    parts = re.split(r"\s+", sku.strip().upper())
+    parts = WHITESPACE_RE.split(sku.strip().upper())
     if len(parts) != 3:
         return None
 
@@ -74,12 +82,23 @@ def format_sku(sku):
 
 
 def check_single_image(args):
-    """Check single image URL - for parallel execution"""
+    """
+    Check single image URL - for parallel execution.
+    A HEAD with Content-Length settles it without downloading the image;
+    GET only when HEAD is refused or the size is not declared, and then
+    only the first MIN_SIZE bytes are read.
+    """
     session, url, view_index = args
     try:
-        response = session.get(url, timeout=TIMEOUT)
-        if response.status_code == 200 and len(response.content) >= MIN_SIZE:
-            return (view_index, url, True)
+        response = session.head(url, timeout=TIMEOUT, allow_redirects=True)
+        length = response.headers.get("Content-Length", "")
+        if response.status_code == 200 and length.isdigit():
+            return (view_index, url, int(length) >= MIN_SIZE)
+        if response.status_code != 200 and response.status_code not in HEAD_UNSUPPORTED:
+            return (view_index, url, False)  # 404 - no GET needed
+        with session.get(url, timeout=TIMEOUT, stream=True) as response:
+            if response.status_code == 200 and len(response.raw.read(MIN_SIZE, decode_content=True)) >= MIN_SIZE:
+                return (view_index, url, True)
     except:
         pass
     return (view_index, url, False)
@@ -116,7 +135,6 @@ def scrape(sku, max_images=5, validate=True):
     result["diesel_code"] = f"{first}_{second}_{third}"
 
     # Build all URLs to check
-    session = get_session()
     urls_to_check = []
     for i, view in enumerate(VIEWS):
         filename = f"{first}_{second}_{third}_{view}.jpg"
@@ -125,14 +143,11 @@ def scrape(sku, max_images=5, validate=True):
 
     # Check all views in parallel
     valid_images = []
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        futures = [executor.submit(check_single_image, args) for args in urls_to_check]
-        for future in as_completed(futures):
-            view_index, url, is_valid = future.result()
-            if is_valid:
-                valid_images.append((view_index, url))
-
-    session.close()
+    futures = [executor.submit(check_single_image, args) for args in urls_to_check]
+    for future in as_completed(futures):
+        view_index, url, is_valid = future.result()
+        if is_valid:
+            valid_images.append((view_index, url))
 
     # Sort by view priority and take max_images
     valid_images.sort(key=lambda x: x[0])
@@ -27,6 +27,10 @@ HIGH_RES_PARAMS = "?sw=2000&sh=3000&sm=fit&q=100"
 BASE_URL = "https://www.dsquared2.com"
 TIMEOUT = 15
 
+# Shared keep-alive connections for PDP fetches and image checks
+session = requests.Session()
+session.headers.update(HEADERS)
+
 # ============================================
 # HELPER FUNCTIONS
 # ============================================
@@ -34,7 +38,7 @@ TIMEOUT = 15
 def request_url(url, timeout=TIMEOUT):
     """Simple request with error handling"""
     try:
-        r = requests.get(url, headers=HEADERS, timeout=timeout)
+        r = session.get(url, timeout=timeout)
         if r.status_code == 200:
             return r
     except Exception as e:
@@ -290,7 +294,7 @@ def scrape(sku: str, max_images: int = 5, validate: bool = False) -> dict:
         valid_urls = []
         for url in image_urls:
             try:
-                r = requests.head(url, headers=HEADERS, timeout=10)
+                r = session.head(url, timeout=10)
                 if r.status_code == 200:
                     valid_urls.append(url)
             except:
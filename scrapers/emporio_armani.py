@@ -7,27 +7,39 @@ SKU format: EAEM00282913666UB104 -> EM002829_AF13666_UB104_F_FW2025.jpg
 
 import requests
 from requests.adapters import HTTPAdapter, Retry
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
 # ===================== CONFIGURATION =====================
 CDN_BASE = "https://assets-cf.armani.com/image/upload"
 CDN_PARAMS = "f_auto,q_auto:best,ar_4:5,w_1350,c_fill"
 TIMEOUT = 8
+MAX_WORKERS = 20  # = pool_maxsize, every probe gets its own keep-alive socket
 
 # Fabric prefixes - AF is most common, then TE
-FABRIC_PREFIXES = ["AF", "TE", "TS", "TF", "TK", "TN"]
+FABRIC_PREFIXES = ("AF", "TE", "TS", "TF", "TK", "TN")
 
 # Seasons - newest first
-SEASONS = ["FW2025", "SS2025", "FW2024", "SS2024"]
+SEASONS = ("FW2025", "SS2025", "FW2024", "SS2024")
+
+# Prefix x season HEADs in flight during detection - the two common prefixes
+# first, the rarer ones only go out once those have missed
+DETECT_WINDOW = 2 * len(SEASONS)
 
 # Image suffixes
-IMG_SUFFIXES = ["F", "D", "R", "E", "A", "B"]
+IMG_SUFFIXES = ("F", "D", "R", "E", "A", "B")
 
 # ===================== HTTP SESSION =====================
 session = requests.Session()
 retries = Retry(total=2, backoff_factor=0.2, status_forcelist=(500, 502, 503, 504))
-session.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retries))
+session.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=MAX_WORKERS, max_retries=retries))
 session.headers.update({"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/124"})
 
+# All probes go to the same CDN host - fan them out over the pool
+# instead of paying one round trip per candidate
+executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+
 
 def http_head(url):
     """Quick check if URL exists"""
@@ -85,15 +97,26 @@ def build_url(brand, model, prefix, fabric, color, suffix, season):
 def detect_prefix(brand, model, fabric, color):
     """
     Quickly detect which fabric prefix works (AF, TE, etc).
-    Try HEAD request on F image for each prefix.
+    HEAD the F image for prefix x season combos in parallel, at most
+    DETECT_WINDOW at a time; first hit in priority order wins and the
+    HEADs still queued are cancelled.
     Returns (prefix, season) or (None, None)
     """
-    for prefix in FABRIC_PREFIXES:
-        for season in SEASONS:
-            url = build_url(brand, model, prefix, fabric, color, "F", season)
-            if http_head(url):
-                return (prefix, season)
-    return (None, None)
+    combos = ((prefix, season) for prefix in FABRIC_PREFIXES for season in SEASONS)
+    pending = deque()
+    try:
+        while True:
+            for prefix, season in islice(combos, DETECT_WINDOW - len(pending)):
+                url = build_url(brand, model, prefix, fabric, color, "F", season)
+                pending.append(((prefix, season), executor.submit(http_head, url)))
+            if not pending:
+                return (None, None)
+            combo, future = pending.popleft()
+            if future.result():
+                return combo
+    finally:
+        for _, future in pending:
+            future.cancel()
 
 
 # ===================== MAIN SCRAPE FUNCTION =====================
@@ -140,23 +163,11 @@ def scrape(sku: str, max_images: int = 5, validate: bool = False) -> dict:
     result["season"] = season
     result["armani_code"] = f"{brand}{model}-{prefix}{fabric}-{color}"
 
-    # Collect image URLs
-    image_urls = []
-    for suffix in IMG_SUFFIXES:
-        if len(image_urls) >= max_images:
-            break
-
-        url = build_url(brand, model, prefix, fabric, color, suffix, season)
-
-        if validate:
-            # Actually download to verify
-            img = http_get(url)
-            if img:
-                image_urls.append(url)
-        else:
-            # Just check with HEAD
-            if http_head(url):
-                image_urls.append(url)
+    # Collect image URLs - probe all suffixes in parallel, keep suffix order
+    urls = [build_url(brand, model, prefix, fabric, color, suffix, season) for suffix in IMG_SUFFIXES]
+    # validate: actually download to verify, otherwise just check with HEAD
+    check = http_get if validate else http_head
+    image_urls = [url for url, ok in zip(urls, executor.map(check, urls)) if ok][:max_images]
 
     if not image_urls:
         result["error"] = f"No images found for {result['armani_code']}"
@@ -15,6 +15,8 @@ from concurrent.futures import ThreadPoolExecutor
 TIMEOUT = 20
 MIN_SIZE = 10000
 MAX_WORKERS = 8
+SKU_RE = re.compile(r"^EJ(M)?BG(\d+)-PX([A-Z0-9]+)(?:-([A-Z0-9]+))?$")
+SHOP_IMG_RE = re.compile(r"https://[^\"']+/cdn/shop/[^\"']+\.(?:jpg|jpeg|png|webp)", re.I)
 
 BASE = "https://www.enterprise-japan.com"
 FILES = f"{BASE}/cdn/shop/files"
@@ -34,7 +36,7 @@ def convert_sku(code):
     EJMBG5017-PX65001040 → ['bg5017px65001040']
     """
     s = code.strip().upper().replace(" ", "")
-    m = re.match(r"^EJ(M)?BG(\d+)-PX([A-Z0-9]+)(?:-([A-Z0-9]+))?$", s)
+    m = SKU_RE.match(s)
     if not m:
         return []
     _, digits, px, tail = m.groups()
@@ -112,7 +114,7 @@ def from_pdp(handle):
             if u and "/cdn/shop/" in u:
                 cand.append(urljoin(purl, u))
     
-    cand += re.findall(r"https://[^\"']+/cdn/shop/[^\"']+\.(?:jpg|jpeg|png|webp)", r.text, flags=re.I)
+    cand += SHOP_IMG_RE.findall(r.text)
     
     cleaned = [u.split("?")[0] for u in cand]
     seen, uniq = set(), []
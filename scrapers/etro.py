@@ -12,6 +12,7 @@ from requests.adapters import HTTPAdapter, Retry
 CDN_BASE = "https://content.etro.com/Adaptations"
 TIMEOUT = 10
 MIN_SIZE = 2000
+HEAD_UNSUPPORTED = (403, 405, 501)  # CDN refuses HEAD - fall back to a streamed GET
 
 # Size directories to try (larger first)
 SIZE_DIRS = ["1500", "1200", "900", "600"]
@@ -59,9 +60,16 @@ def convert_sku(sku):
 
 
 def try_url(url):
-    """Try to fetch URL, return True if valid image"""
+    """
+    Check URL from its headers only, return True if valid image.
+    HEAD first; if refused, a streamed GET whose body is never read - the
+    with-block closes it so the connection goes back to the pool.
+    """
     try:
-        r = session.get(url, stream=True, timeout=TIMEOUT)
+        r = session.head(url, timeout=TIMEOUT, allow_redirects=True)
+        if r.status_code in HEAD_UNSUPPORTED:
+            with session.get(url, stream=True, timeout=TIMEOUT) as r:
+                pass
         if r.status_code == 200:
             content_length = int(r.headers.get("Content-Length", "0"))
             if content_length > MIN_SIZE:
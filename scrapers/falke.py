@@ -10,18 +10,14 @@ import time
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, quote_plus
-from io import BytesIO
-
-try:
-    from PIL import Image
-    HAS_PIL = True
-except ImportError:
-    HAS_PIL = False
 
 TIMEOUT = 25
 MIN_SIZE = 8000
 PAUSE = 0.5
 
+SKU_RE = re.compile(r"FA(\d+)-(\d+)")
+IMAGE_RE = re.compile(r"https://static\.falke\.com/(?:pdmain|pdzoom)/[^\s\"']+?\.jpg")
+
 LOCALES = ["uk_en", "en", "de_en", "de_de"]
 
 SESSION = requests.Session()
@@ -37,7 +33,7 @@ def convert_sku(sku):
     """
     FA14633-3000 → 14633_3000
     """
-    m = re.match(r"FA(\d+)-(\d+)", sku.strip())
+    m = SKU_RE.match(sku.strip())
     if not m:
         return ""
     return f"{m.group(1)}_{m.group(2)}"
@@ -89,10 +85,7 @@ def extract_images(html):
     if not html:
         return []
     
-    candidates = re.findall(
-        r"https://static\.falke\.com/(?:pdmain|pdzoom)/[^\s\"']+?\.jpg",
-        html
-    )
+    candidates = IMAGE_RE.findall(html)
     
     seen = set()
     out = []
@@ -103,6 +96,13 @@ def extract_images(html):
     return out
 
 
+def is_complete_image(content):
+    """JPEG sa SOI i EOI markerom ili PNG/WebP potpis - bez dekodiranja (PIL)"""
+    if content[:3] == b"\xff\xd8\xff":
+        return content[-2:] == b"\xff\xd9"  # odsečen JPEG nema EOI
+    return content[:8] == b"\x89PNG\r\n\x1a\n" or (content[:4] == b"RIFF" and content[8:12] == b"WEBP")
+
+
 def download_image(url):
     """Download and validate image"""
     for attempt in range(3):
@@ -110,15 +110,8 @@ def download_image(url):
             r = SESSION.get(url, timeout=TIMEOUT, stream=True)
             if r.status_code == 200:
                 content = r.content
-                if content and len(content) >= MIN_SIZE:
-                    if HAS_PIL:
-                        try:
-                            Image.open(BytesIO(content)).verify()
-                            return content
-                        except:
-                            pass
-                    else:
-                        return content
+                if content and len(content) >= MIN_SIZE and is_complete_image(content):
+                    return content
             time.sleep(PAUSE)
         except:
             time.sleep(PAUSE)
@@ -19,6 +19,17 @@ import re
 import hashlib
 import time
 
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+try:
+    from scrapers.common import HASH_PREFIX_BYTES, HASH_RANGE, body_size
+except ImportError:
+    from common import HASH_PREFIX_BYTES, HASH_RANGE, body_size
+
 # ===================== CONFIGURATION =====================
 BASE_URL = "https://www.liujo.com"
 SEARCH_URL = f"{BASE_URL}/int/search"
@@ -31,6 +42,10 @@ HEADERS = {
     "Accept-Language": "en-US,en;q=0.9",
 }
 
+# SKU-independent page patterns (the SKU-specific ones are built per call)
+PRODUCT_HREF_RE = re.compile(r'href="(/int/[^"]+\.html)"')
+JSON_IMG_RE = re.compile(r'"(https?:[^"]+demandware\.static[^"]+\.jpg)"')
+
 # ===================== HTTP SESSION =====================
 def make_session():
     """Create HTTP session with retry logic"""
@@ -41,10 +56,15 @@ def make_session():
     s.headers.update(HEADERS)
     return s
 
+# Built once - headers, retry adapters and keep-alive sockets are reused by every scrape
+SESSION = make_session()
+
 # ===================== HELPERS =====================
-def sha1_hash(content: bytes) -> str:
-    """Generate SHA1 hash for deduplication"""
-    return hashlib.sha1(content).hexdigest()
+def content_hash(content: bytes) -> str:
+    """Hash for deduplication - xxh3 when available, SHA1 otherwise"""
+    if HAS_XXHASH:
+        return xxhash.xxh3_128(content).hexdigest()
+    return hashlib.sha1(content, usedforsecurity=False).hexdigest()
 
 def convert_sku(our_sku: str) -> str:
     """
@@ -91,7 +111,7 @@ def search_product(session, sku: str) -> dict:
             return {"found": True, "product_url": product_url, "liujo_sku": liujo_sku}
 
         # Method 2: Find any URL containing our SKU
-        all_urls = re.findall(r'href="(/int/[^"]+\.html)"', html)
+        all_urls = PRODUCT_HREF_RE.findall(html)
         for url in all_urls:
             if liujo_sku.upper() in url.upper():
                 product_url = f"{BASE_URL}{url}"
@@ -110,7 +130,7 @@ def search_product(session, sku: str) -> dict:
             response.raise_for_status()
             html = response.text
 
-            all_urls = re.findall(r'href="(/int/[^"]+\.html)"', html)
+            all_urls = PRODUCT_HREF_RE.findall(html)
             for url in all_urls:
                 if liujo_sku.upper() in url.upper():
                     product_url = f"{BASE_URL}{url}"
@@ -163,8 +183,7 @@ def extract_images_from_page(session, product_url: str, liujo_sku: str) -> list:
                 images.append(full_url)
 
         # Look in JSON data (often used for galleries)
-        json_img_pattern = r'"(https?:[^"]+demandware\.static[^"]+\.jpg)"'
-        json_matches = re.findall(json_img_pattern, html)
+        json_matches = JSON_IMG_RE.findall(html)
 
         for url in json_matches:
             url = url.replace("\\u002F", "/")
@@ -182,16 +201,22 @@ def extract_images_from_page(session, product_url: str, liujo_sku: str) -> list:
         return []
 
 def validate_image(session, url: str) -> tuple:
-    """Check if URL returns valid image. Returns (is_valid, content, hash)"""
+    """
+    Check if URL returns valid image. Returns (is_valid, hash)
+    Only the first 64 KiB is downloaded - two different product shots never
+    share that prefix and size, so the hash is just as good for dedup.
+    """
     try:
-        r = session.get(url, timeout=TIMEOUT)
-        if r.status_code == 200 and r.content and len(r.content) > MIN_BYTES:
+        r = session.get(url, timeout=TIMEOUT, headers=HASH_RANGE)
+        size = body_size(r)
+        if r.status_code in (200, 206) and r.content and size > MIN_BYTES:
             content_type = r.headers.get("Content-Type", "").lower()
-            if "image" in content_type or len(r.content) > 10000:
-                return True, r.content, sha1_hash(r.content)
-        return False, None, None
+            if "image" in content_type or size > 10000:
+                prefix = r.content[:HASH_PREFIX_BYTES]
+                return True, content_hash(prefix + b"/%d" % size)
+        return False, None
     except Exception:
-        return False, None, None
+        return False, None
 
 def scrape(sku: str, max_images: int = 5, validate: bool = False) -> dict:
     """
@@ -215,7 +240,7 @@ def scrape(sku: str, max_images: int = 5, validate: bool = False) -> dict:
         "error": None
     }
 
-    session = make_session()
+    session = SESSION
 
     try:
         # Step 1: Search for product
@@ -246,20 +271,17 @@ def scrape(sku: str, max_images: int = 5, validate: bool = False) -> dict:
                 break
 
             if validate:
-                is_valid, content, img_hash = validate_image(session, url)
-                if is_valid and img_hash not in seen_hashes:
-                    seen_hashes.add(img_hash)
-                    images.append({
-                        "url": url,
-                        "index": len(images) + 1,
-                        "filename": f"{formatted_sku}-{len(images) + 1}"
-                    })
-            else:
-                images.append({
-                    "url": url,
-                    "index": len(images) + 1,
-                    "filename": f"{formatted_sku}-{len(images) + 1}"
-                })
+                is_valid, img_hash = validate_image(session, url)
+                if not is_valid or img_hash in seen_hashes:
+                    continue
+                seen_hashes.add(img_hash)
+
+            idx = len(images) + 1
+            images.append({
+                "url": url,
+                "index": idx,
+                "filename": f"{formatted_sku}-{idx}"
+            })
 
         result["images"] = images
         result["count"] = len(images)
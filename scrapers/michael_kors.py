@@ -37,6 +37,9 @@ SCENE7_RE = re.compile(
     re.IGNORECASE,
 )
 
+# Image number in a Scene7 URL (..._1, ..._2)
+SUFFIX_RE = re.compile(r'_(\d+)')
+
 
 def parse_sku(sku):
     """Parse MK SKU: MC30F4GY5H3T-251 -> (model, color)"""
@@ -97,7 +100,7 @@ def extract_images(html, target_model, target_color):
         html, re.IGNORECASE
     )
     for url in scene7_generic:
-        suf_match = re.search(r'_(\d+)', url)
+        suf_match = SUFFIX_RE.search(url)
         suf = suf_match.group(1) if suf_match else "0"
         candidates.append((url, suf, "scene7"))
 
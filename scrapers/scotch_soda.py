@@ -16,8 +16,15 @@ try:
 except ImportError:
     HAS_PIL = False
 
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
 TIMEOUT = 25
 MIN_SIZE = 12000
+CHUNK_SIZE = 64 * 1024  # Stream chunk - hashed, then dropped
 
 BASE_CDN = "https://scotch-soda.eu/cdn/shop/files"
 IMG_PARAM = "?width=1800"
@@ -97,19 +104,45 @@ def normalize_image(data, ctype):
     return data
 
 
+def new_hasher():
+    """Hasher for deduplication - xxh3 when available, MD5 otherwise"""
+    if HAS_XXHASH:
+        return xxhash.xxh3_128()
+    return hashlib.md5(usedforsecurity=False)
+
+
+def content_hash(data):
+    """Hash for deduplication of a whole body"""
+    hasher = new_hasher()
+    hasher.update(data)
+    return hasher.hexdigest()
+
+
 def fetch_image(url):
-    """Download and normalize image"""
+    """
+    Validate image and hash it for dedup. Returns (ok, hash)
+    PNG/JPEG stream straight into the hasher - the body is never held in
+    memory; only WEBP/AVIF are read whole to be converted (normalize_image).
+    """
     try:
-        r = SESSION.get(url, timeout=TIMEOUT)
-        if r.status_code != 200:
-            return None, None
-        
-        data = normalize_image(r.content, r.headers.get("Content-Type", ""))
-        if data:
-            return data, hashlib.md5(data).hexdigest()
-        return None, None
+        with SESSION.get(url, timeout=TIMEOUT, stream=True) as r:
+            if r.status_code != 200:
+                return False, None
+            ctype = r.headers.get("Content-Type", "")
+            if HAS_PIL and ("webp" in ctype.lower() or "avif" in ctype.lower()):
+                data = normalize_image(r.content, ctype)
+                return (True, content_hash(data)) if data else (False, None)
+
+            hasher = new_hasher()
+            size = 0
+            for chunk in r.iter_content(CHUNK_SIZE):
+                hasher.update(chunk)
+                size += len(chunk)
+            if size < MIN_SIZE:
+                return False, None
+            return True, hasher.hexdigest()
     except:
-        return None, None
+        return False, None
 
 
 def scrape(sku, max_images=5, validate=True):
@@ -138,8 +171,8 @@ def scrape(sku, max_images=5, validate=True):
             break
         
         if validate:
-            data, img_hash = fetch_image(url)
-            if not data or img_hash in seen_hashes:
+            ok, img_hash = fetch_image(url)
+            if not ok or img_hash in seen_hashes:
                 continue
             seen_hashes.add(img_hash)
         
@@ -5,20 +5,32 @@ Uses $desktopProductZoom$ for high-res images
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+try:
+    from scrapers.common import REQUEST_THREADS
+except ImportError:
+    from common import REQUEST_THREADS
+
 BASE_URL = "https://coach.scene7.com/is/image/Coach/"
 SUFFIXES = ["a0", "a1", "a2", "a3", "a4", "a5", "a6", "a7", "a8", "a9", "a10"]
 TIMEOUT = 10
 MIN_VALID_BYTES = 5000
 MAX_WORKERS = 11  # All suffixes in parallel
 
+# One keep-alive pool shared by all probes - bare requests.get() opened a
+# fresh TCP + TLS connection for every candidate URL
+session = requests.Session()
+session.headers.update({"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"})
+session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS * REQUEST_THREADS))
+
 
 def convert_sku(sku):
     """
     Convert SKU format: CHCAF55-B4-MPL → caf55_b4mpl
     """
-    sku = sku.replace("CH", "").lower()
+    sku = sku.removeprefix("CH").lower()
     parts = sku.split("-")
     if len(parts) >= 3:
         return f"{parts[0]}_{parts[1]}{parts[2]}"
@@ -29,8 +41,7 @@ def check_single_image(args):
     """Check single image URL - for parallel execution"""
     url, index = args
     try:
-        headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
-        response = requests.get(url, headers=headers, timeout=TIMEOUT)
+        response = session.get(url, timeout=TIMEOUT)
         if response.status_code == 200:
             content_type = response.headers.get("Content-Type", "")
             if "image" in content_type and len(response.content) > MIN_VALID_BYTES:
@@ -4,12 +4,24 @@ Endpoint: /scrape-golden-goose
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+try:
+    from scrapers.common import REQUEST_THREADS
+except ImportError:
+    from common import REQUEST_THREADS
+
 TIMEOUT = 10
 MIN_VALID_BYTES = 5000
 MAX_WORKERS = 5  # Check all 5 images in parallel
 
+# One keep-alive pool shared by all probes - bare requests.get() opened a
+# fresh TCP + TLS connection for every candidate URL
+session = requests.Session()
+session.headers.update({"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"})
+session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS * REQUEST_THREADS))
+
 
 def convert_sku(sku):
     """
@@ -43,8 +55,7 @@ def check_single_image(args):
     """Check single image URL - for parallel execution"""
     url, index = args
     try:
-        headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
-        response = requests.get(url, headers=headers, timeout=TIMEOUT)
+        response = session.get(url, timeout=TIMEOUT)
         if response.status_code == 200 and len(response.content) > MIN_VALID_BYTES:
             return (index, url, True)
     except:
@@ -8,15 +8,25 @@ Hybris CDN - mora da pretražuje sajt
 import re
 import requests
 from requests.adapters import HTTPAdapter, Retry
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+try:
+    from scrapers.common import first_valid_images, validate_image
+except ImportError:
+    from common import first_valid_images, validate_image
 
 TIMEOUT = (5, 15)
 MIN_SIZE = 5000
+MAX_WORKERS = 10  # = pool_maxsize, one keep-alive socket per image check
+# Slike iz medias/sys_master - kompajlirano jednom
+IMAGE_RE = re.compile(r'https://strellson\.com/medias/sys_master/images/images/[^"\'>\s]+')
 
 # Session
 def make_session():
     s = requests.Session()
     retries = Retry(total=2, backoff_factor=0.3)
-    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retries)
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=MAX_WORKERS, max_retries=retries)
     s.mount("https://", adapter)
     s.headers.update({
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/124",
@@ -25,6 +35,7 @@ def make_session():
     return s
 
 SESSION = make_session()
+executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
 
 
 def convert_sku(sku):
@@ -91,8 +102,7 @@ def get_images_from_page(url):
             return []
         
         # Traži slike iz medias/sys_master
-        pattern = r'https://strellson\.com/medias/sys_master/images/images/[^"\'>\s]+'
-        matches = re.findall(pattern, r.text)
+        matches = IMAGE_RE.findall(r.text)
         
         # Dedupliciraj i filtriraj
         seen = set()
@@ -108,17 +118,6 @@ def get_images_from_page(url):
         return []
 
 
-def validate_image(url):
-    """Proveri da li slika postoji"""
-    try:
-        r = SESSION.get(url, timeout=TIMEOUT)
-        if r.status_code == 200 and len(r.content) > MIN_SIZE:
-            return True, r.content
-        return False, None
-    except:
-        return False, None
-
-
 def scrape(sku, max_images=5, validate=True):
     """
     Glavni scrape funkcija
@@ -155,17 +154,14 @@ def scrape(sku, max_images=5, validate=True):
         result["error"] = "No images found on product page"
         return result
     
-    # Validiraj i dodaj slike
+    # Validiraj paralelno, redom - staje kad nadje max_images validnih
+    if validate:
+        check = partial(validate_image, SESSION, timeout=TIMEOUT, min_size=MIN_SIZE)
+        image_urls = first_valid_images(executor, check, image_urls, max_images, MAX_WORKERS)
+    
+    # Dodaj slike
     images = []
-    for i, url in enumerate(image_urls):
-        if len(images) >= max_images:
-            break
-        
-        if validate:
-            is_valid, _ = validate_image(url)
-            if not is_valid:
-                continue
-        
+    for url in image_urls[:max_images]:
         images.append({
             "url": url,
             "index": len(images) + 1,
@@ -16,6 +16,15 @@ HEADERS = {
     "Accept-Language": "en-GB,en;q=0.9"
 }
 
+# M1012761AAUU -> model + color (no space between them)
+MODEL_COLOR_RE = re.compile(r'(M\d{7}[A-Z]?)([A-Z]{2,4})')
+# Image CDNs, in priority order: laguna-live (primary), cdn-colect, static
+IMAGE_RES = (
+    re.compile(r'(https://images\.laguna-live\.sd\.co\.uk/[^"\'<>\s]+\.(?:jpg|png|webp))'),
+    re.compile(r'(https://images\.cdn-colect\.com/[^"\'<>\s]+\.(?:jpg|png|webp))'),
+    re.compile(r'(https://static\.superdry\.com/[^"\'<>\s]+\.(?:jpg|png|webp))'),
+)
+
 
 def parse_sku(sku):
     """
@@ -37,7 +46,7 @@ def parse_sku(sku):
         return model, color
     elif len(parts) == 1:
         # Try to split M1012761AAUU format
-        match = re.match(r'(M\d{7}[A-Z]?)([A-Z]{2,4})', parts[0])
+        match = MODEL_COLOR_RE.match(parts[0])
         if match:
             return match.group(1), match.group(2)
         return parts[0], None
@@ -104,20 +113,9 @@ def extract_images_from_page(html):
     if not html:
         return images
 
-    # Laguna-live CDN (primary)
-    laguna_pattern = r'(https://images\.laguna-live\.sd\.co\.uk/[^"\'<>\s]+\.(?:jpg|png|webp))'
-    laguna_images = re.findall(laguna_pattern, html)
-    images.extend(laguna_images)
-
-    # CDN-colect (alternative)
-    colect_pattern = r'(https://images\.cdn-colect\.com/[^"\'<>\s]+\.(?:jpg|png|webp))'
-    colect_images = re.findall(colect_pattern, html)
-    images.extend(colect_images)
-
-    # Superdry static CDN
-    static_pattern = r'(https://static\.superdry\.com/[^"\'<>\s]+\.(?:jpg|png|webp))'
-    static_images = re.findall(static_pattern, html)
-    images.extend(static_images)
+    # Laguna-live CDN (primary), CDN-colect (alternative), Superdry static CDN
+    for image_re in IMAGE_RES:
+        images.extend(image_re.findall(html))
 
     # Deduplicate and filter
     unique_images = []
@@ -9,15 +9,23 @@ import re
 import requests
 from bs4 import BeautifulSoup
 from requests.adapters import HTTPAdapter, Retry
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+try:
+    from scrapers.common import first_valid_images, validate_image
+except ImportError:
+    from common import first_valid_images, validate_image
 
 TIMEOUT = (5, 15)
 MIN_SIZE = 5000
+MAX_WORKERS = 10  # = pool_maxsize, one keep-alive socket per image check
 
 # Session
 def make_session():
     s = requests.Session()
     retries = Retry(total=2, backoff_factor=0.3)
-    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retries)
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=MAX_WORKERS, max_retries=retries)
     s.mount("https://", adapter)
     s.headers.update({
         "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 Chrome/120",
@@ -26,6 +34,7 @@ def make_session():
     return s
 
 SESSION = make_session()
+executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
 
 BASES = [
     "https://www.woolrich.com/eu/en/",
@@ -101,17 +110,6 @@ def extract_images(html, img_token):
     return clean
 
 
-def validate_image(url):
-    """Proveri da li slika postoji"""
-    try:
-        r = SESSION.get(url, timeout=TIMEOUT)
-        if r.status_code == 200 and len(r.content) > MIN_SIZE:
-            return True, r.content
-        return False, None
-    except:
-        return False, None
-
-
 def scrape(sku, max_images=5, validate=True):
     """
     Glavni scrape funkcija
@@ -150,17 +148,14 @@ def scrape(sku, max_images=5, validate=True):
             result["woolrich_code"] = their_code
             result["product_url"] = product_url
             
-            # Validiraj i dodaj slike
+            # Validiraj paralelno, redom - staje kad nadje max_images validnih
+            if validate:
+                check = partial(validate_image, SESSION, timeout=TIMEOUT, min_size=MIN_SIZE)
+                image_urls = first_valid_images(executor, check, image_urls, max_images, MAX_WORKERS)
+            
+            # Dodaj slike
             images = []
-            for url in image_urls:
-                if len(images) >= max_images:
-                    break
-                
-                if validate:
-                    is_valid, _ = validate_image(url)
-                    if not is_valid:
-                        continue
-                
+            for url in image_urls[:max_images]:
                 images.append({
                     "url": url,
                     "index": len(images) + 1,